@@ -19,6 +19,9 @@ GOLD_ID_FALLBACK = -1
 # Domyślna liczba workerów dla pobierania regionów
 REGIONS_WORKERS_DEFAULT = 8
 
+# Diagnostyka bonusów podczas przetwarzania regionów (REGIONS_DEBUG=1)
+REGIONS_DEBUG = os.getenv("REGIONS_DEBUG", "0") == "1"
+
 # ===== KONFIGURACJA ARBITRAŻU =====
 
 # Koszty transakcji
@@ -38,6 +41,19 @@ API_WORKERS_ANALYSIS = int(os.getenv("API_WORKERS_ANALYSIS", "4"))
 API_WORKERS_REGIONS = int(os.getenv("API_WORKERS_REGIONS", "8"))
 API_WORKERS_WAR = int(os.getenv("API_WORKERS_WAR", "12"))
 API_WORKERS_HITS = int(os.getenv("API_WORKERS_HITS", "16"))
+API_WORKERS_ITEM_PAGES = int(os.getenv("API_WORKERS_ITEM_PAGES", "4"))
+# Równoległe zapytania o oferty towarów (market/items/get)
+API_WORKERS_ITEM_OFFERS = int(os.getenv("API_WORKERS_ITEM_OFFERS", "16"))
+# Rozmiar wspólnej puli wątków dla zapytań do API (src/data/api/executor.py)
+API_WORKERS_IO = int(os.getenv("API_WORKERS_IO", str(min(64, (os.cpu_count() or 1) * 8))))
+
+# Czas (s) życia odpowiedzi API prawie statycznych endpointów (0 wyłącza cache)
+API_CACHE_TTL_COUNTRIES = float(os.getenv("API_CACHE_TTL_COUNTRIES", "21600"))
+API_CACHE_TTL_ITEMS = float(os.getenv("API_CACHE_TTL_ITEMS", "86400"))
+API_CACHE_TTL_REGIONS = float(os.getenv("API_CACHE_TTL_REGIONS", "3600"))
+
+# Czas (s) przez jaki wyniki zdeduplikowanych zapytań (RequestLoader) są ponownie używane
+API_LOADER_TTL_SECONDS = float(os.getenv("API_LOADER_TTL_SECONDS", "60"))
 
 # Parametry analizy
 MAX_OPPORTUNITIES_TO_ANALYZE = int(os.getenv("MAX_OPPORTUNITIES_TO_ANALYZE", "1000"))
@@ -20,6 +20,17 @@ from src.reports.generators.short_economic_report import generate_short_economic
 from src.core.services.calculator_service import ProductionCalculator
 
 
+_orchestrator = None
+
+
+def get_orchestrator() -> DatabaseFirstOrchestrator:
+    """Return the orchestrator shared by all runs in this process"""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = DatabaseFirstOrchestrator()
+    return _orchestrator
+
+
 def get_report_sections() -> dict:
     """Get user input for report sections to include"""
     sections = {
@@ -71,7 +82,7 @@ def run_production_analysis(output_dir: str) -> None:
     print("🏭 Regional productivity analysis...")
     try:
         # Use new Database-First orchestrator
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         sections = {
             'military': False,
             'warriors': False, 
@@ -96,7 +107,7 @@ def run_arbitrage_analysis(output_dir: str, min_profit: float) -> None:
     print("💰 Currency arbitrage analysis...")
     try:
         # Use new Database-First orchestrator
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         sections = {
             'military': False,
             'warriors': False, 
@@ -121,7 +132,7 @@ def run_short_economic_report(output_dir: str) -> None:
     print("📊 Generating short economic report...")
     try:
         # Use new Database-First orchestrator
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         sections = {
             'military': False,
             'warriors': False, 
@@ -154,7 +165,7 @@ def run_google_sheets_report(output_dir: str, sections: dict) -> None:
     print("📊 Generating Google Sheets report...")
     try:
         # Use Database-First orchestrator
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         result = orchestrator.run(sections, "google_sheets", output_dir)
         
         if result.startswith("❌"):
@@ -171,7 +182,7 @@ def run_google_sheets_economic_report(output_dir: str) -> None:
     print("📊 Generating Google Sheets economic report...")
     try:
         # Use Database-First orchestrator with economic sections only
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         sections = {
             'military': False,
             'warriors': False, 
@@ -213,7 +224,7 @@ def run_orchestrator_html(output_dir: str, sections: dict = None) -> None:
     """Run orchestrator with HTML report generation"""
     print("🌐 Generating daily HTML report...")
     try:
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         result = orchestrator.run(sections, "html", output_dir)
         if result.startswith("❌"):
             print(f"❌ HTML report failed: {result}")
@@ -238,7 +249,7 @@ def run_full_analysis(output_dir: str, min_profit: float, sections: dict = None)
     
     print("📊 Generating comprehensive report with all data...")
     try:
-        orchestrator = DatabaseFirstOrchestrator()
+        orchestrator = get_orchestrator()
         result = orchestrator.run(sections, "daily", output_dir)
         if result.startswith("❌"):
             print(f"❌ Full analysis failed: {result}")
@@ -281,7 +292,7 @@ def interactive_menu():
             sections = get_report_sections()
             print("📋 Generating daily DOCX report using Database-First approach...")
             try:
-                orchestrator = DatabaseFirstOrchestrator()
+                orchestrator = get_orchestrator()
                 result = orchestrator.run(sections, "daily", output_dir)
                 if result.startswith("❌"):
                     print(f"❌ Report generation failed: {result}")
@@ -299,7 +310,7 @@ def interactive_menu():
             sections = get_report_sections()
             print("🌐 Generating daily HTML report using Database-First approach...")
             try:
-                orchestrator = DatabaseFirstOrchestrator()
+                orchestrator = get_orchestrator()
                 result = orchestrator.run(sections, "html", output_dir)
                 if result.startswith("❌"):
                     print(f"❌ HTML report generation failed: {result}")
@@ -372,7 +383,7 @@ def interactive_menu():
         elif choice == '11':
             print("🔄 Forcing database update...")
             try:
-                orchestrator = DatabaseFirstOrchestrator()
+                orchestrator = get_orchestrator()
                 sections = {
                     'military': True,
                     'warriors': True, 
@@ -390,7 +401,7 @@ def interactive_menu():
         elif choice == '12':
             print("📊 Database Status:")
             try:
-                orchestrator = DatabaseFirstOrchestrator()
+                orchestrator = get_orchestrator()
                 db_info = orchestrator.get_database_info()
                 print(f"  📅 Last refresh: {db_info['last_refresh']}")
                 print(f"  ✅ Is fresh: {db_info['is_fresh']}")
@@ -489,7 +500,7 @@ Usage examples:
                 # Use get_report_sections() function so user can select sections
                 sections = get_report_sections()
                 try:
-                    orchestrator = DatabaseFirstOrchestrator()
+                    orchestrator = get_orchestrator()
                     result = orchestrator.run(sections, "daily", args.output_dir)
                     if result.startswith("❌"):
                         print(f"❌ Report generation failed: {result}")
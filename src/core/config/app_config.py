@@ -229,7 +229,8 @@ class DependencyContainer:
         """Initialize strategy instances"""
         from src.core.services.base_service import ServiceDependencies
         from src.core.strategies.data_fetching_strategy import (
-            FullDataFetchingStrategy, OptimizedDataFetchingStrategy, CachedDataFetchingStrategy
+            FullDataFetchingStrategy, OptimizedDataFetchingStrategy, CachedDataFetchingStrategy,
+            ShortEconomicDataFetchingStrategy, ArbitrageDataFetchingStrategy
         )
         
         # Ensure repositories are initialized first
@@ -250,5 +251,7 @@ class DependencyContainer:
         self._strategies = {
             'full_fetching': FullDataFetchingStrategy(deps),
             'optimized_fetching': OptimizedDataFetchingStrategy(deps),
-            'cached_fetching': CachedDataFetchingStrategy(deps, self.config.cache.ttl_minutes)
+            'cached_fetching': CachedDataFetchingStrategy(deps, self.config.cache.ttl_minutes),
+            'short_economic_fetching': ShortEconomicDataFetchingStrategy(deps),
+            'arbitrage_fetching': ArbitrageDataFetchingStrategy(deps)
         }
@@ -12,10 +12,23 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from config.settings.base import API_LOADER_TTL_SECONDS
 from src.data.api.client import fetch_data
+from src.data.api.request_loader import RequestLoader
 from src.core.models.entities import ArbitrageOpportunity
 
 
+def _fetch_job_offers_for_country(country_id: int) -> Optional[List[Dict[str, Any]]]:
+    """Pobiera surowe oferty pracy z API dla jednego kraju"""
+    res = fetch_data(f"market/jobs/get?country_id={country_id}", f"ofertach pracy w kraju {country_id}")
+    if res and res.get("code") == 200:
+        return res.get("data", [])
+    return None
+
+
+_job_offers_loader = RequestLoader(_fetch_job_offers_for_country, ttl_seconds=API_LOADER_TTL_SECONDS)
+
+
 @dataclass
 class MarketOffer:
     """Reprezentuje ofertę na rynku"""
@@ -506,71 +519,109 @@ class MarketCalculationService:
         Returns:
             Lista prawidłowo sformatowanych ofert pracy
         """
-        all_jobs = []
+        offers_by_country = self.fetch_job_offers_by_country(countries)
+        return self.build_job_offers(countries, offers_by_country, currency_rates, gold_id)
+    
+    def fetch_job_offers_by_country(self, countries: Dict[int, Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Pobiera surowe oferty pracy ze wszystkich krajów (bez przeliczania na GOLD).
+        
+        Args:
+            countries: Słownik krajów
+            
+        Returns:
+            Słownik mapujący ID kraju na listę ofert z API
+        """
+        offers_by_country = {}
         
-        for country_id, country_info in countries.items():
+        for country_id in countries:
             try:
-                # Pobierz oferty pracy w danym kraju
-                url = f"market/jobs/get?country_id={country_id}"
-                res = fetch_data(url, f"ofertach pracy w kraju {country_info.get('name', country_id)}")
-                
-                if res and res.get("code") == 200:
-                    offers = res.get("data", [])
-                    if offers:
-                        # Zbierz oferty z tego kraju
-                        country_jobs = []
-                        for offer in offers:
-                            salary = offer.get("value")  # API uses "value" not "salary"
-                            if not salary:
-                                continue
-                                
-                            try:
-                                salary_f = float(salary)
-                            except (ValueError, TypeError):
-                                continue
-                            
-                            # Przelicz na GOLD
-                            currency_id = country_info.get("currency_id")
-                            if currency_id == gold_id:
-                                salary_gold = salary_f
-                            else:
-                                rate = currency_rates.get(currency_id)
-                                if not rate or rate <= 0:
-                                    continue
-                                salary_gold = salary_f * rate
-                            
-                            # ✅ POPRAWKA: Stwórz prawidłowy job_title
-                            business_id = offer.get("business_id", "N/A")
-                            if business_id != "N/A":
-                                job_title = f"Business #{business_id}"
-                            else:
-                                job_title = "Job Offer"
-                            
-                            job_offer = JobOffer(
-                                country_id=country_id,
-                                country_name=country_info.get("name", f"Country {country_id}"),
-                                currency_id=currency_id,
-                                currency_name=country_info.get("currency_name", f"Currency {currency_id}"),
-                                business_id=business_id,
-                                salary_local=salary_f,
-                                salary_gold=salary_gold,
-                                amount=offer.get("amount", 1),
-                                economic_skill=offer.get("economic_skill", 0),
-                                job_title=job_title
-                            )
-                            
-                            country_jobs.append(job_offer)
-                        
-                        # Sortuj oferty w tym kraju od najwyższej płacy
-                        country_jobs.sort(key=lambda x: x.salary_gold, reverse=True)
-                        
-                        # Dodaj posortowane oferty z tego kraju do listy głównej
-                        all_jobs.extend(country_jobs)
+                # Pobierz oferty pracy w danym kraju (zapytania o ten sam kraj są łączone)
+                offers = _job_offers_loader.load(country_id)
+                if offers:
+                    offers_by_country[country_id] = offers
                             
             except Exception as e:
                 print(f"Error fetching job offers from country {country_id}: {e}")
                 continue
         
+        return offers_by_country
+    
+    def build_job_offers(self,
+                         countries: Dict[int, Dict[str, Any]],
+                         offers_by_country: Dict[int, List[Dict[str, Any]]],
+                         currency_rates: Dict[int, float],
+                         gold_id: int) -> List[JobOffer]:
+        """
+        Przelicza pobrane oferty pracy na GOLD i tworzy obiekty JobOffer.
+        
+        Args:
+            countries: Słownik krajów
+            offers_by_country: Surowe oferty z fetch_job_offers_by_country
+            currency_rates: Kursy walut względem GOLD
+            gold_id: ID waluty GOLD
+            
+        Returns:
+            Lista prawidłowo sformatowanych ofert pracy
+        """
+        all_jobs = []
+        
+        for country_id, offers in offers_by_country.items():
+            country_info = countries[country_id]
+            # Kurs i nazwy są stałe dla kraju - wylicz raz przed pętlą po ofertach
+            currency_id = country_info.get("currency_id")
+            if currency_id == gold_id:
+                rate = 1.0
+            else:
+                rate = currency_rates.get(currency_id)
+                if not rate or rate <= 0:
+                    continue
+            country_name = country_info.get("name", f"Country {country_id}")
+            currency_name = country_info.get("currency_name", f"Currency {currency_id}")
+            
+            # Zbierz oferty z tego kraju
+            country_jobs = []
+            for offer in offers:
+                salary = offer.get("value")  # API uses "value" not "salary"
+                if not salary:
+                    continue
+                    
+                try:
+                    salary_f = float(salary)
+                except (ValueError, TypeError):
+                    continue
+                
+                # Przelicz na GOLD
+                salary_gold = salary_f * rate
+                
+                # ✅ POPRAWKA: Stwórz prawidłowy job_title
+                business_id = offer.get("business_id", "N/A")
+                if business_id != "N/A":
+                    job_title = f"Business #{business_id}"
+                else:
+                    job_title = "Job Offer"
+                
+                job_offer = JobOffer(
+                    country_id=country_id,
+                    country_name=country_name,
+                    currency_id=currency_id,
+                    currency_name=currency_name,
+                    business_id=business_id,
+                    salary_local=salary_f,
+                    salary_gold=salary_gold,
+                    amount=offer.get("amount", 1),
+                    economic_skill=offer.get("economic_skill", 0),
+                    job_title=job_title
+                )
+                
+                country_jobs.append(job_offer)
+            
+            # Sortuj oferty w tym kraju od najwyższej płacy
+            country_jobs.sort(key=lambda x: x.salary_gold, reverse=True)
+            
+            # Dodaj posortowane oferty z tego kraju do listy głównej
+            all_jobs.extend(country_jobs)
+        
         print(f"💼 Znaleziono łącznie {len(all_jobs)} ofert pracy ze wszystkich krajów")
         
         return all_jobs
@@ -11,8 +11,10 @@ Licensed under the MIT License - see LICENSE file for details.
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import os
+import time
 
 from src.core.services.economy_service import fetch_countries_and_currencies, fetch_country_statistics, build_currency_rates_map
+from src.data.database.models import load_regions_data
 
 
 @dataclass
@@ -52,12 +54,18 @@ class ProductionFactors:
     is_on_sale: bool = False
 
 
+# Jak długo (s) tablica bonusów krajowych zbudowana z bazy jest używana ponownie
+COUNTRY_BONUS_TABLE_TTL_SECONDS = 300
+
+
 class ProductionCalculationService:
     """Centralny serwis do wszystkich obliczeń produktywności"""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or os.getenv("ECLESIAR_DB_PATH", "eclesiar.db")
         self.npc_wages_cache = {}
+        self._country_bonus_table: Optional[Dict[Tuple[str, str], float]] = None
+        self._country_bonus_table_loaded_at = 0.0
         
         # Mapping bonus types to products (API uses uppercase)
         self.bonus_type_mapping = {
@@ -114,6 +122,14 @@ class ProductionCalculationService:
                 "building_type": "Industrial Zone"
             },
         }
+        
+        # Proporcje produkcji Q1-Q5 względem wybranego tieru, liczone raz dla każdej pary (towar, tier)
+        quality_keys = ("q1", "q2", "q3", "q4", "q5")
+        self._quality_ratios: Dict[Tuple[str, str], Tuple[float, ...]] = {
+            (item, tier_key): tuple(config[q] / config[tier_key] for q in quality_keys)
+            for item, config in self.base_production.items()
+            for tier_key in quality_keys
+        }
     
     def load_npc_wages_data(self):
         """Loads real NPC wages data from database (DB-first approach)"""
@@ -330,16 +346,31 @@ class ProductionCalculationService:
         # Import region calculation service and delegate
         from src.core.services.calculations.region_calculation_service import RegionCalculationService
         
+        region_calc = RegionCalculationService()
+        
         if all_regions is None:
+            # Regiony z bazy są agregowane raz do tablicy (kraj, typ bonusu) -> bonus,
+            # zamiast wczytywać i przeglądać wszystkie regiony przy każdym wywołaniu
+            table = self._get_country_bonus_table(region_calc)
+            if table is None:
+                return 0.0
+            return region_calc.lookup_country_bonus(table, country_name, item_name)
+        
+        return region_calc.calculate_country_bonus(country_name, item_name, all_regions)
+    
+    def _get_country_bonus_table(self, region_calc) -> Optional[Dict[Tuple[str, str], float]]:
+        """Zwraca tablicę bonusów krajowych zbudowaną z regionów w bazie (z krótkim TTL)"""
+        now = time.monotonic()
+        if (self._country_bonus_table is None or
+                now - self._country_bonus_table_loaded_at >= COUNTRY_BONUS_TABLE_TTL_SECONDS):
             # Try to load regions from database
             try:
-                from src.data.database.models import load_regions_data
                 all_regions, _ = load_regions_data()
             except Exception:
-                return 0.0
-        
-        region_calc = RegionCalculationService()
-        return region_calc.calculate_country_bonus(country_name, item_name, all_regions)
+                return None
+            self._country_bonus_table = region_calc.build_country_bonus_table(all_regions)
+            self._country_bonus_table_loaded_at = now
+        return self._country_bonus_table
     
     def calculate_full_production(self, region_data: Dict[str, Any], item_name: str, 
                                 factors: ProductionFactors) -> Optional[ProductionResult]:
@@ -356,7 +387,8 @@ class ProductionCalculationService:
         """
         try:
             # Pobierz bazową produkcję dla towaru
-            item_config = self.base_production.get(item_name.lower())
+            item_key = item_name.lower()
+            item_config = self.base_production.get(item_key)
             if not item_config:
                 return None
             
@@ -441,12 +473,13 @@ class ProductionCalculationService:
             # Zastosuj zaokrąglenie integer dla eco skill (zgodnie z dokumentacją)
             production = int(production)
             
-            # Oblicz produkcję dla wszystkich jakości (używając proporcji)
-            production_q1 = int(production * (item_config["q1"] / item_config[tier_key]))
-            production_q2 = int(production * (item_config["q2"] / item_config[tier_key]))
-            production_q3 = int(production * (item_config["q3"] / item_config[tier_key]))
-            production_q4 = int(production * (item_config["q4"] / item_config[tier_key]))
-            production_q5 = int(production * (item_config["q5"] / item_config[tier_key]))
+            # Oblicz produkcję dla wszystkich jakości (używając wcześniej policzonych proporcji)
+            ratio_q1, ratio_q2, ratio_q3, ratio_q4, ratio_q5 = self._quality_ratios[(item_key, tier_key)]
+            production_q1 = int(production * ratio_q1)
+            production_q2 = int(production * ratio_q2)
+            production_q3 = int(production * ratio_q3)
+            production_q4 = int(production * ratio_q4)
+            production_q5 = int(production * ratio_q5)
             
             # Oblicz score efektywności (wyższy = lepszy)
             efficiency_score = (production_q5 * 5 + production_q4 * 4 + production_q3 * 3 + 
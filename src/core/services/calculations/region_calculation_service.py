@@ -8,6 +8,7 @@ Copyright (c) 2025 Teo693
 Licensed under the MIT License - see LICENSE file for details.
 """
 
+from collections import defaultdict
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 
@@ -187,6 +188,45 @@ class RegionCalculationService:
             print(f"Error calculating country bonus for {country_name}: {e}")
             return 0.0
     
+    def build_country_bonus_table(self, regions_data: List[Dict[str, Any]]) -> Dict[Tuple[str, str], float]:
+        """
+        Oblicza bonusy krajowe dla wszystkich par (kraj, typ bonusu) w jednym przebiegu.
+        
+        Wynik dla każdej pary jest taki sam jak calculate_country_bonus, ale regiony
+        przegląda się raz zamiast przy każdym zapytaniu o kraj i towar.
+        
+        Args:
+            regions_data: Lista regionów z bazy danych
+            
+        Returns:
+            Słownik (nazwa kraju małymi literami, typ bonusu) -> bonus krajowy w procentach
+        """
+        seen_regions = set()
+        totals: Dict[Tuple[str, str], float] = defaultdict(float)
+        
+        for region in regions_data:
+            country_key = (region.get('country_name') or '').lower()
+            # Zachowaj tylko pierwszy (najnowszy) region o danej nazwie w kraju
+            region_key = (country_key, (region.get('region_name', region.get('name', '')) or '').lower())
+            if region_key in seen_regions:
+                continue
+            seen_regions.add(region_key)
+            
+            bonus_description = region.get('bonus_description', '')
+            if not bonus_description:
+                continue
+            for bonus_type, bonus_value in self._parse_bonus_description(bonus_description).items():
+                if bonus_value > 0:
+                    totals[(country_key, bonus_type)] += bonus_value
+        
+        return {key: total / 5.0 for key, total in totals.items()}
+    
+    def lookup_country_bonus(self, country_bonus_table: Dict[Tuple[str, str], float],
+                             country_name: str, item_name: str) -> float:
+        """Zwraca bonus krajowy z tablicy zbudowanej przez build_country_bonus_table"""
+        bonus_type = self.bonus_type_mapping.get(item_name.lower(), "GRAIN")
+        return country_bonus_table.get((country_name.lower(), bonus_type), 0.0)
+    
     def get_country_bonus_info(self, country_name: str, item_name: str, regions_data: List[Dict[str, Any]]) -> CountryBonusInfo:
         """
         Zwraca szczegółowe informacje o bonusie krajowym.
@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from src.reports.generators.production_report import ProductionAnalyzer, ProductionData
 from src.core.services.economy_service import fetch_countries_and_currencies, fetch_country_statistics
 from src.data.api.client import fetch_data
+from src.data.database.models import load_regions_data
 from src.core.services.calculations import ProductionCalculationService, ProductionFactors
 
 
@@ -65,7 +66,6 @@ class ProductionCalculator:
             
             # Try to load real region data from database
             try:
-                from src.data.database.models import load_regions_data
                 self.regions_data, summary = load_regions_data()
                 
                 if self.regions_data:
@@ -10,6 +10,7 @@ Licensed under the MIT License - see LICENSE file for details.
 """
 
 import os
+import traceback
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -26,6 +27,11 @@ from src.reports.generators.short_economic_report import generate_short_economic
 from src.data.storage.cache import save_historical_data, load_historical_data
 
 
+# Report types that never read market item offers - their database refresh skips the
+# per-country x per-item market scan
+REPORTS_WITHOUT_MARKET_ITEMS = frozenset({"arbitrage"})
+
+
 class DatabaseFirstOrchestrator:
     """
     Orchestrator implementing DB-first flow according to refactoring plan.
@@ -104,7 +110,7 @@ class DatabaseFirstOrchestrator:
         
         try:
             # STEP 1: Check database freshness and update if needed
-            if not self._ensure_fresh_database(sections):
+            if not self._ensure_fresh_database(sections, report_type):
                 return "❌ Failed to update database"
             
             # STEP 2: Load all data from database
@@ -127,7 +133,7 @@ class DatabaseFirstOrchestrator:
             print(f"❌ Error in Database-First Orchestrator: {e}")
             return f"❌ Error: {e}"
     
-    def _ensure_fresh_database(self, sections: Dict[str, bool]) -> bool:
+    def _ensure_fresh_database(self, sections: Dict[str, bool], report_type: str = "daily") -> bool:
         """
         Ensures that the database is fresh.
         Updates database if it's outdated or refresh is forced.
@@ -140,7 +146,9 @@ class DatabaseFirstOrchestrator:
         
         # Database requires update
         print("🔄 Database needs refresh, updating from API...")
-        return self.db_manager.update_database_full(sections)
+        return self.db_manager.update_database_full(
+            sections, include_market_items=report_type not in REPORTS_WITHOUT_MARKET_ITEMS
+        )
     
     def _load_data_from_database(self, sections: Dict[str, bool]) -> Optional[Dict[str, Any]]:
         """
@@ -561,7 +569,6 @@ class DatabaseFirstOrchestrator:
                 
         except Exception as e:
             print(f"❌ Error generating Google Sheets report: {e}")
-            import traceback
             traceback.print_exc()
             return "❌ Failed to generate report"
     
@@ -13,17 +13,21 @@ import json
 import os
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
-from src.data.database.models import init_db, save_snapshot, save_item_prices_from_cheapest
+from src.data.database.models import (
+    init_db, save_item_prices_from_cheapest, REGIONS_DATA_INSERT_SQL, region_rows
+)
+from src.data.database.async_writer import snapshot_writer
 from src.data.api.client import fetch_data
+from src.data.api.executor import get_io_executor
 from src.core.services.economy_service import (
     fetch_countries_and_currencies,
-    build_currency_rates_map,
     fetch_country_statistics,
     get_lowest_npc_wage_countries,
-    fetch_cheapest_items_from_all_countries,
-    fetch_best_jobs_from_all_countries
+    fetch_rates_jobs_and_cheapest_items,
+    fetch_items_by_type,
+    invalidate_countries_cache
 )
 from src.core.services.regions_service import fetch_and_process_regions
 from src.core.services.military_service import process_hits_data, build_wars_summary
@@ -121,17 +125,21 @@ class DatabaseManagerService:
     
     def _connect(self) -> sqlite3.Connection:
         """Tworzy połączenie z bazą danych"""
-        conn = sqlite3.connect(self.db_path)
+        # Dłuższy timeout - sekcje aktualizacji zapisują do bazy równolegle
+        conn = sqlite3.connect(self.db_path, timeout=30)
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA foreign_keys=ON;")
         return conn
     
-    def update_database_full(self, sections: Dict[str, bool] = None) -> bool:
+    def update_database_full(self, sections: Dict[str, bool] = None, include_market_items: bool = True) -> bool:
         """
         Kompletna aktualizacja bazy danych ze wszystkimi danymi potrzebnymi do raportów.
         
         Args:
             sections: Sekcje do zaktualizowania
+            include_market_items: Czy pobierać oferty towarów ze wszystkich krajów
+                (najdroższa część sekcji ekonomicznej; zbędna np. dla arbitrażu)
             
         Returns:
             True jeśli aktualizacja się powiodła, False w przeciwnym razie
@@ -146,34 +154,44 @@ class DatabaseManagerService:
         
         print("🔄 Starting full database update...")
         success = True
+        # Pełna aktualizacja ponownie wczytuje listę krajów (API lub cache odpowiedzi z TTL)
+        invalidate_countries_cache()
         
         try:
-            # 1. Aktualizuj dane ekonomiczne
-            if sections.get('economic', False):
-                print("💰 Updating economic data...")
-                if not self._update_economic_data():
-                    success = False
+            # Regiony i dane militarne potrzebują listy krajów; pobierz ją raz (wynik jest
+            # zapamiętany, więc sekcja ekonomiczna użyje tej samej odpowiedzi API)
+            eco_countries = None
+            if sections.get('production', False) or sections.get('military', False):
+                eco_countries, _, _, _ = fetch_countries_and_currencies()
             
-            # 2. Aktualizuj dane regionów (dla produktywności)
+            # Sekcje są niezależne i ograniczone przez I/O - uruchom je równolegle
+            phases = []
+            if sections.get('economic', False):
+                phases.append(("💰 Updating economic data...", self._update_economic_data, (include_market_items,)))
             if sections.get('production', False):
-                print("🏭 Updating regions data...")
-                if not self._update_regions_data():
-                    success = False
-            
-            # 3. Aktualizuj dane militarne
+                phases.append(("🏭 Updating regions data...", self._update_regions_data, (eco_countries,)))
             if sections.get('military', False):
-                print("⚔️ Updating military data...")
-                if not self._update_military_data():
-                    success = False
-            
-            # 4. Aktualizuj dane wojowników
+                phases.append(("⚔️ Updating military data...", self._update_military_data, (eco_countries,)))
             if sections.get('warriors', False):
-                print("🏆 Updating warriors data...")
-                if not self._update_warriors_data():
-                    success = False
-            
-            # 5. Zapisz timestamp ostatniej aktualizacji
-            self._update_last_refresh_timestamp()
+                phases.append(("🏆 Updating warriors data...", self._update_warriors_data, ()))
+            
+            if phases:
+                # Osobna pula: sekcje czekają na zadania we wspólnej puli I/O
+                with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+                    futures = []
+                    for message, update, args in phases:
+                        print(message)
+                        futures.append(executor.submit(update, *args))
+                    for future in as_completed(futures):
+                        if not future.result():
+                            success = False
+            
+            # Dokończ zapis snapshotów API z kolejki i zapisz timestamp ostatniej aktualizacji.
+            # Aktualizacja bez ofert towarów jest częściowa - nie oznaczaj bazy jako świeżej,
+            # bo raporty korzystające z market_offers/item_prices czytałyby stare ceny.
+            snapshot_writer.flush()
+            if include_market_items or not sections.get('economic', False):
+                self._update_last_refresh_timestamp()
             
             if success:
                 print("✅ Database update completed successfully")
@@ -186,7 +204,7 @@ class DatabaseManagerService:
         
         return success
     
-    def _update_economic_data(self) -> bool:
+    def _update_economic_data(self, include_market_items: bool = True) -> bool:
         """Aktualizuje dane ekonomiczne w bazie danych"""
         try:
             # Pobierz kraje i waluty
@@ -198,23 +216,25 @@ class DatabaseManagerService:
             # Zapisz waluty i kody walut
             self._save_currencies_data(currencies_map, currency_codes_map)
             
-            # Pobierz i zapisz kursy walut
-            currency_rates = build_currency_rates_map(currencies_map, gold_id)
-            self._save_currency_rates(currency_rates)
+            # Pobierz i zapisz mapę przedmiotów (tylko gdy raport korzysta z ofert towarów)
+            items_map = {}
+            if include_market_items:
+                items_map = fetch_items_by_type("economic")
+                self._save_items_map(items_map)  # Zapisz items_map
+            else:
+                print("⏭️ Skipping market items (not needed for this report)")
             
-            # Pobierz i zapisz najlepsze oferty pracy
-            best_jobs = fetch_best_jobs_from_all_countries(eco_countries, currency_rates, gold_id)
+            # Pobierz równolegle kursy walut, oferty pracy i najtańsze przedmioty
+            currency_rates, best_jobs, cheapest_items = fetch_rates_jobs_and_cheapest_items(
+                eco_countries, currencies_map, items_map, gold_id
+            )
+            self._save_currency_rates(currency_rates)
             self._save_job_offers(best_jobs)
-            
-            # Pobierz i zapisz najtańsze przedmioty
-            from src.core.services.economy_service import fetch_items_by_type
-            items_map = fetch_items_by_type("economic")
-            self._save_items_map(items_map)  # Zapisz items_map
-            cheapest_items = fetch_cheapest_items_from_all_countries(eco_countries, items_map, currency_rates, gold_id)
-            self._save_market_offers(cheapest_items, items_map)
-            
-            # Zapisz ceny do tabeli item_prices dla obliczania średnich historycznych
-            save_item_prices_from_cheapest(cheapest_items)
+            if include_market_items:
+                self._save_market_offers(cheapest_items, items_map)
+                
+                # Zapisz ceny do tabeli item_prices dla obliczania średnich historycznych
+                save_item_prices_from_cheapest(cheapest_items)
             
             return True
             
@@ -222,11 +242,12 @@ class DatabaseManagerService:
             print(f"❌ Error updating economic data: {e}")
             return False
     
-    def _update_regions_data(self) -> bool:
+    def _update_regions_data(self, eco_countries: Optional[Dict[int, Dict[str, Any]]] = None) -> bool:
         """Aktualizuje dane regionów w bazie danych"""
         try:
-            # Pobierz kraje jeśli nie ma ich w bazie
-            eco_countries = self._get_countries_from_db()
+            # Pobierz kraje jeśli nie zostały przekazane ani nie ma ich w bazie
+            if not eco_countries:
+                eco_countries = self._get_countries_from_db()
             if not eco_countries:
                 eco_countries, _, _, _ = fetch_countries_and_currencies()
             
@@ -240,27 +261,34 @@ class DatabaseManagerService:
             print(f"❌ Error updating regions data: {e}")
             return False
     
-    def _update_military_data(self) -> bool:
+    def _update_military_data(self, eco_countries: Optional[Dict[int, Dict[str, Any]]] = None) -> bool:
         """Aktualizuje dane militarne w bazie danych"""
         try:
             # Pobierz kraje dla mapowania
-            eco_countries = self._get_countries_from_db()
+            if not eco_countries:
+                eco_countries = self._get_countries_from_db()
             if not eco_countries:
                 eco_countries, _, _, _ = fetch_countries_and_currencies()
             
-            # Pobierz dane o walkach
-            hits_response = fetch_data("military/battles", "military hits data")
-            if hits_response:
-                hits_data = process_hits_data(hits_response, eco_countries)
-            else:
-                hits_data = []
-            
-            # Pobierz dane o wojnach
-            wars_response = fetch_data("military/wars", "military wars data")
-            if wars_response:
-                wars_summary = build_wars_summary(wars_response, eco_countries)
-            else:
-                wars_summary = {}
+            # Pobierz równolegle dane o walkach i wojnach (niezależne endpointy) i przetwarzaj
+            # odpowiedź, która przyjdzie pierwsza, zamiast czekać na wolniejszy request
+            executor = get_io_executor()
+            hits_future = executor.submit(fetch_data, "military/battles", "military hits data")
+            wars_future = executor.submit(fetch_data, "military/wars", "military wars data")
+            
+            hits_data: Any = []
+            wars_summary: Dict[str, Any] = {}
+            pending = {hits_future, wars_future}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    response = future.result()
+                    if not response:
+                        continue
+                    if future is hits_future:
+                        hits_data = process_hits_data(response, eco_countries)
+                    else:
+                        wars_summary = build_wars_summary(response, eco_countries)
             
             # Zapisz dane militarne
             self._save_military_data(hits_data, wars_summary)
@@ -464,30 +492,8 @@ class DatabaseManagerService:
             conn.execute("DELETE FROM regions_data WHERE created_at < ?", (cutoff,))
             conn.execute("DELETE FROM regions_summary WHERE created_at < ?", (cutoff,))
             
-            # Wstaw nowe dane regionów
-            for region in regions_data:
-                bonus_by_type_json = json.dumps(region.get('bonus_by_type', {}))
-                conn.execute("""
-                    INSERT INTO regions_data 
-                    (created_at, region_name, country_name, country_id, pollution, 
-                     bonus_score, bonus_description, bonus_by_type, population, 
-                     nb_npcs, type, original_country_id, bonus_per_pollution)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    ts,
-                    region.get('region_name', ''),
-                    region.get('country_name', ''),
-                    region.get('country_id', 0),
-                    region.get('pollution', 0.0),
-                    region.get('bonus_score', 0),
-                    region.get('bonus_description', ''),
-                    bonus_by_type_json,
-                    region.get('population', 0),
-                    region.get('nb_npcs', 0),
-                    region.get('type', 0),
-                    region.get('original_country_id', 0),
-                    region.get('bonus_per_pollution', 0.0)
-                ))
+            # Wstaw nowe dane regionów jednym executemany
+            conn.executemany(REGIONS_DATA_INSERT_SQL, region_rows(ts, regions_data))
             
             # Wstaw podsumowanie regionów
             conn.execute("""
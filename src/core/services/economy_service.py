@@ -1,15 +1,94 @@
-from collections import defaultdict
+from collections import defaultdict, deque
+import heapq
+import itertools
+import math
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-from config.settings.base import GOLD_ID_FALLBACK
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from config.settings.base import (
+    GOLD_ID_FALLBACK,
+    API_LOADER_TTL_SECONDS,
+    API_WORKERS_ITEM_PAGES,
+    API_WORKERS_ITEM_OFFERS,
+    API_CACHE_TTL_COUNTRIES,
+    API_CACHE_TTL_ITEMS,
+)
 from src.data.api.client import fetch_data
+from src.data.api.executor import get_io_executor
+from src.data.api.response_cache import cached_fetch_data
+from src.data.api.request_loader import RequestLoader
+
+
+# Item name filters (lower-case) used by fetch_items_by_type
+PRODUCTION_ITEMS: FrozenSet[str] = frozenset({
+    "grain",
+    "iron",
+    "titanium",
+    "fuel",
+    "food",
+    "weapon",
+    "aircraft",
+    "airplane ticket",
+})
+
+ECONOMIC_ITEMS: FrozenSet[str] = PRODUCTION_ITEMS | frozenset({
+    "coffee",
+    "hammer",
+    "focus",
+    "protein bar",
+})
+
+ARBITRAGE_ITEMS: FrozenSet[str] = ECONOMIC_ITEMS
+
+# Liczba najtańszych krajów zapamiętywana dla każdego towaru
+CHEAPEST_ITEMS_PER_TYPE = 20
+
+# Wynik fetch_countries_and_currencies: (czas monotoniczny zapisu, wynik), ważny przez API_CACHE_TTL_COUNTRIES
+_countries_cache: Optional[Tuple[float, Tuple[Dict[int, Dict[str, Any]], Dict[int, str], Dict[int, str], Optional[int]]]] = None
+_countries_cache_lock = threading.Lock()
 
 
 def fetch_countries_and_currencies() -> Tuple[Dict[int, Dict[str, Any]], Dict[int, str], Dict[int, str], Optional[int]]:
-    res = fetch_data("countries", "krajach i walutach")
+    """
+    Zwraca kraje, waluty, kody walut i ID GOLD.
+    
+    Wynik jest zapamiętywany na API_CACHE_TTL_COUNTRIES sekund; kolejne wywołania
+    zwracają kopie zapamiętanych słowników (łącznie z danymi poszczególnych krajów),
+    więc modyfikacje po stronie wywołującego nie psują cache.
+    Wynik bez wykrytego GOLD nie jest zapamiętywany.
+    """
+    global _countries_cache
+    with _countries_cache_lock:
+        cached = _countries_cache
+        if cached is None or time.monotonic() - cached[0] >= API_CACHE_TTL_COUNTRIES:
+            result = _fetch_countries_and_currencies()
+            if result[3] is None:
+                return result
+            cached = _countries_cache = (time.monotonic(), result)
+        countries, currencies, currency_codes, gold_id = cached[1]
+    return (
+        {cid: dict(info) for cid, info in countries.items()},
+        dict(currencies),
+        dict(currency_codes),
+        gold_id,
+    )
+
+
+def invalidate_countries_cache() -> None:
+    """Wymusza ponowne pobranie listy krajów przy następnym wywołaniu"""
+    global _countries_cache
+    with _countries_cache_lock:
+        _countries_cache = None
+
+
+def _fetch_countries_and_currencies() -> Tuple[Dict[int, Dict[str, Any]], Dict[int, str], Dict[int, str], Optional[int]]:
+    res = cached_fetch_data("countries", "krajach i walutach", API_CACHE_TTL_COUNTRIES)
     countries: Dict[int, Dict[str, Any]] = {}
     currencies: Dict[int, str] = {}
     currency_codes: Dict[int, str] = {}
@@ -36,57 +115,57 @@ def fetch_countries_and_currencies() -> Tuple[Dict[int, Dict[str, Any]], Dict[in
                 currencies[cur_id] = cur_name
                 if cur_code:
                     currency_codes[cur_id] = cur_code
-            # Identify GOLD as early as possible using reliable signals
-            if gold_id is None:
-                code_upper = (cur_code or "").strip().upper()
-                name_lower = (cur_name or "").strip().lower()
-                # Prefer currency code equality; fall back to name match
-                if code_upper == "GOLD" or name_lower == "gold":
-                    gold_id = cur_id
-
-        # Final pass fallback: in case early detection missed (e.g., empty codes in some rows)
-        if gold_id is None:
-            for cur_id, cur_code in currency_codes.items():
-                if (cur_code or "").strip().upper() == "GOLD":
-                    gold_id = cur_id
-                    break
-        if gold_id is None:
-            for cur_id, cur_name in currencies.items():
-                if str(cur_name).strip().lower() == "gold":
-                    gold_id = cur_id
-                    break
+            # Identify GOLD as early as possible using reliable signals.
+            # Every row is checked here (code or name), so no fallback pass is needed.
+            if gold_id is None and (
+                cur_code.strip().upper() == "GOLD" or cur_name.strip().lower() == "gold"
+            ):
+                gold_id = cur_id
 
     return countries, currencies, currency_codes, gold_id
 
 
+def _fetch_item_page(page: int) -> Optional[Dict[str, Any]]:
+    return cached_fetch_data(f"server/items?page={page}", f"przedmiotach (strona {page})", API_CACHE_TTL_ITEMS)
+
+
+def _iter_item_pages() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Zwraca kolejne strony server/items, pobierając w tle kilka następnych stron.
+    
+    Strony są zwracane w kolejności; pierwsza pusta lub błędna strona kończy iterację,
+    a niepotrzebne już zapytania z okna są anulowane.
+    """
+    window_size = max(1, API_WORKERS_ITEM_PAGES)
+    pages = itertools.count(1)
+    executor = get_io_executor()
+    window = deque(executor.submit(_fetch_item_page, page) for page in itertools.islice(pages, window_size))
+    try:
+        while window:
+            res = window.popleft().result()
+            if not res or res.get("code") != 200:
+                break
+            data = res.get("data") or []
+            if not data:
+                break
+            window.append(executor.submit(_fetch_item_page, next(pages)))
+            yield data
+    finally:
+        for future in window:
+            future.cancel()
+
+
 def fetch_all_items() -> Dict[int, str]:
     items: Dict[int, str] = {}
-    page = 1
-    while True:
-        url = f"server/items?page={page}"
-        res = fetch_data(url, f"przedmiotach (strona {page})")
-        if res and res.get("code") != 200:
-            break
-        data = res.get("data") or []
-        if not data:
-            break
+    for data in _iter_item_pages():
         for it in data:
             iid = it.get("id")
+            if iid is None:
+                continue
             base_name = it.get("name") or f"Item {iid}"
             quality = it.get("quality") or it.get("q") or it.get("tier")
             # Normalize to lower-case for consistent display (e.g., "iron", "weapon q2")
-            display_name = str(base_name).lower()
-            try:
-                q_int = int(quality) if quality is not None else None
-            except Exception:
-                q_int = None
-            if q_int is not None and q_int > 0:
-                if f"q{q_int}" not in display_name:
-                    display_name = f"{display_name} q{q_int}"
-
-            if iid is not None:
-                items[iid] = display_name
-        page += 1
+            items[iid] = _item_display_name(str(base_name).lower(), quality)
     return items
 
 
@@ -97,105 +176,98 @@ def fetch_items_by_type(report_type: str = "daily") -> Dict[int, str]:
     """
     if report_type == "production":
         # For production analysis, only fetch items that can be produced
-        production_items = {
-            "grain": True,
-            "iron": True, 
-            "titanium": True,
-            "fuel": True,
-            "food": True,
-            "weapon": True,
-            "aircraft": True,
-            "airplane ticket": True,
-        }
-        return _fetch_filtered_items(production_items)
+        return _fetch_filtered_items(PRODUCTION_ITEMS)
     
     elif report_type == "economic":
         # For economic reports, fetch commonly traded items
-        economic_items = {
-            "grain": True,
-            "iron": True,
-            "titanium": True,
-            "fuel": True,
-            "food": True,
-            "weapon": True,
-            "aircraft": True,
-            "airplane ticket": True,
-            "coffee": True,
-            "hammer": True,
-            "focus": True,
-            "protein bar": True,
-        }
-        return _fetch_filtered_items(economic_items)
+        return _fetch_filtered_items(ECONOMIC_ITEMS)
     
     elif report_type == "arbitrage":
         # For arbitrage analysis, fetch commonly traded items
-        arbitrage_items = {
-            "grain": True,
-            "iron": True,
-            "titanium": True,
-            "fuel": True,
-            "food": True,
-            "weapon": True,
-            "aircraft": True,
-            "airplane ticket": True,
-            "coffee": True,
-            "hammer": True,
-            "focus": True,
-            "protein bar": True,
-        }
-        return _fetch_filtered_items(arbitrage_items)
+        return _fetch_filtered_items(ARBITRAGE_ITEMS)
     
     else:
         # For daily reports or full analysis, fetch all items
         return fetch_all_items()
 
 
-def _fetch_filtered_items(needed_items: Dict[str, bool]) -> Dict[int, str]:
+def _fetch_filtered_items(needed_items: FrozenSet[str]) -> Dict[int, str]:
     """
     Fetch only items that match the needed_items filter.
     """
     items: Dict[int, str] = {}
-    page = 1
-    while True:
-        url = f"server/items?page={page}"
-        res = fetch_data(url, f"przedmiotach (strona {page})")
-        if res and res.get("code") != 200:
-            break
-        data = res.get("data") or []
-        if not data:
-            break
+    for data in _iter_item_pages():
         for it in data:
             iid = it.get("id")
             base_name = it.get("name") or f"Item {iid}"
-            quality = it.get("quality") or it.get("q") or it.get("tier")
             
-            # Normalize to lower-case for consistent display
-            display_name = str(base_name).lower()
-            try:
-                q_int = int(quality) if quality is not None else None
-            except Exception:
-                q_int = None
-            if q_int is not None and q_int > 0:
-                if f"q{q_int}" not in display_name:
-                    display_name = f"{display_name} q{q_int}"
+            # Normalize to lower-case once - used for both the filter and display
+            base_name_lower = sys.intern(str(base_name).lower())
+            if base_name_lower not in needed_items:
+                print(f"⏭️ Skipping unnecessary item: {base_name_lower}")
+                continue
             
-            # Check if this item is needed
-            base_name_lower = str(base_name).lower()
-            if base_name_lower in needed_items:
-                items[iid] = display_name
-                print(f"✅ Found needed item: {display_name}")
-            else:
-                print(f"⏭️ Skipping unnecessary item: {display_name}")
-                
-        page += 1
+            quality = it.get("quality") or it.get("q") or it.get("tier")
+            display_name = _item_display_name(base_name_lower, quality)
+            items[iid] = display_name
+            print(f"✅ Found needed item: {display_name}")
     return items
 
 
+def _to_float(value: Any) -> Optional[float]:
+    """Konwertuje wartość z API na float; liczby bez try/except, None dla błędnych danych"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Konwertuje wartość z API na int; liczby bez try/except, None dla błędnych danych"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    if isinstance(value, float):
+        try:
+            return int(value)
+        except (ValueError, OverflowError):
+            return None
+    return None
+
+
+def _item_display_name(base_name_lower: str, quality: Any) -> str:
+    """Dokleja sufiks jakości (np. "weapon q2"), jeśli nazwa jeszcze go nie zawiera"""
+    if quality is None:
+        return base_name_lower
+    try:
+        q_int = int(quality)
+    except Exception:
+        return base_name_lower
+    if q_int > 0:
+        tag = f"q{q_int}"
+        if tag not in base_name_lower:
+            return f"{base_name_lower} {tag}"
+    return base_name_lower
+
+
 def fetch_currency_to_gold_rate(currency_id: int) -> Optional[float]:
     """
     Pobiera najlepszą ofertę SELL dla waluty z API.
     Zwraca najniższy dostępny kurs (pierwsza oferta).
+    Równoległe zapytania o tę samą walutę są łączone w jedno.
     """
+    return _currency_rate_loader.load(currency_id)
+
+
+def _fetch_currency_to_gold_rate(currency_id: int) -> Optional[float]:
     try:
         # Pobierz oferty SELL (sprzedaż waluty za GOLD)
         sell_res = fetch_data(f"market/coin/get?currency_id={currency_id}&transaction=SELL", f"currency rates {currency_id}")
@@ -210,14 +282,9 @@ def fetch_currency_to_gold_rate(currency_id: int) -> Optional[float]:
         # Zbierz wszystkie kursy
         rates = []
         for offer in offers:
-            rate = offer.get("rate")
-            if rate is not None:
-                try:
-                    rate_f = float(rate)
-                    if rate_f > 0:
-                        rates.append(rate_f)
-                except (ValueError, TypeError):
-                    continue
+            rate_f = _to_float(offer.get("rate"))
+            if rate_f is not None and rate_f > 0:
+                rates.append(rate_f)
         
         if not rates:
             return None
@@ -232,6 +299,9 @@ def fetch_currency_to_gold_rate(currency_id: int) -> Optional[float]:
     return None
 
 
+_currency_rate_loader = RequestLoader(_fetch_currency_to_gold_rate, ttl_seconds=API_LOADER_TTL_SECONDS)
+
+
 def build_currency_rates_map(currencies: Dict[int, str], gold_id: int) -> Dict[int, float]:
     """Buduje mapę kursów walut względem GOLD"""
     rates_map = {}
@@ -254,18 +324,17 @@ def build_currency_rates_map(currencies: Dict[int, str], gold_id: int) -> Dict[i
 
 def compute_currency_extremes(currency_rates: Dict[int, float], currencies: Dict[int, str], gold_id: int) -> Tuple[Tuple[int, float], Tuple[int, float]]:
     """Oblicza skrajne kursy walut (najdroższa i najtańsza)"""
-    if not currency_rates:
-        return (None, None)
-    
-    # Usuń GOLD z analizy
-    rates_for_analysis = {cid: rate for cid, rate in currency_rates.items() if cid != gold_id}
+    most_expensive = None
+    cheapest = None
     
-    if not rates_for_analysis:
-        return (None, None)
-    
-    # Znajdź najdroższą i najtańszą walutę
-    most_expensive = max(rates_for_analysis.items(), key=lambda x: x[1])
-    cheapest = min(rates_for_analysis.items(), key=lambda x: x[1])
+    # Znajdź najdroższą i najtańszą walutę w jednym przebiegu (z pominięciem GOLD)
+    for cid, rate in currency_rates.items():
+        if cid == gold_id:
+            continue
+        if most_expensive is None or rate > most_expensive[1]:
+            most_expensive = (cid, rate)
+        if cheapest is None or rate < cheapest[1]:
+            cheapest = (cid, rate)
     
     return most_expensive, cheapest
 
@@ -302,90 +371,291 @@ def fetch_cheapest_items_from_all_countries(
     gold_id: int
 ) -> Dict[int, List[Dict[str, Any]]]:
     """Pobiera najtańsze towary każdego rodzaju ze wszystkich krajów - zwraca listę 5 najtańszych dla każdego towaru"""
-    cheapest_items = {}
     print(f"DEBUG: Starting to fetch cheapest goods for {len(items)} items from {len(countries)} countries")
     
+    offers_by_item = _fetch_item_offers(countries, items)
+    cheapest_items = _select_cheapest_items(countries, items, offers_by_item, currency_rates, gold_id)
+    
+    print(f"DEBUG: Finished fetching cheapest goods. Found {len(cheapest_items)} item types")
+    return cheapest_items
+
+
+def fetch_rates_jobs_and_cheapest_items(
+    countries: Dict[int, Dict[str, Any]],
+    currencies: Dict[int, str],
+    items: Dict[int, str],
+    gold_id: int
+) -> Tuple[Dict[int, float], List[Dict[str, Any]], Dict[int, List[Dict[str, Any]]]]:
+    """
+    Pobiera kursy walut, oferty pracy i oferty towarów równolegle.
+    
+    Oferty pracy i towarów potrzebują kursów dopiero przy przeliczaniu na GOLD,
+    więc wszystkie trzy fazy sieciowe startują jednocześnie, a przeliczenie
+    odbywa się po ich zakończeniu.
+    
+    Returns:
+        Krotka (kursy walut, oferty pracy w formacie legacy, najtańsze towary)
+    """
+    from src.core.services.calculations.market_calculation_service import MarketCalculationService
+    
+    market_service = MarketCalculationService()
+    
+    executor = get_io_executor()
+    rates_future = executor.submit(build_currency_rates_map, currencies, gold_id)
+    jobs_future = executor.submit(market_service.fetch_job_offers_by_country, countries)
+    offers_future = executor.submit(_fetch_item_offers, countries, items)
+    
+    currency_rates = rates_future.result()
+    offers_by_country = jobs_future.result()
+    offers_by_item = offers_future.result()
+    
+    job_offers = market_service.build_job_offers(countries, offers_by_country, currency_rates, gold_id)
+    best_jobs = market_service.convert_job_offers_to_legacy_format(job_offers)
+    cheapest_items = _select_cheapest_items(countries, items, offers_by_item, currency_rates, gold_id)
+    
+    return currency_rates, best_jobs, cheapest_items
+
+
+# None = jeszcze nie sprawdzono, czy API zwraca oferty towaru ze wszystkich krajów naraz
+_bulk_item_offers_supported: Optional[bool] = None
+_bulk_item_offers_lock = threading.Lock()
+
+_item_offers_executor: Optional[ThreadPoolExecutor] = None
+_item_offers_executor_lock = threading.Lock()
+
+
+def _get_item_offers_executor() -> ThreadPoolExecutor:
+    """
+    Zwraca osobną pulę wątków dla zapytań o oferty rynkowe, tworzoną raz na proces.
+
+    _fetch_item_offers sama działa jako zadanie wspólnej puli I/O, więc nie może
+    wysyłać do niej swoich zapytań i czekać na ich wynik.
+    """
+    global _item_offers_executor
+    if _item_offers_executor is not None:
+        return _item_offers_executor
+
+    with _item_offers_executor_lock:
+        if _item_offers_executor is None:
+            _item_offers_executor = ThreadPoolExecutor(
+                max_workers=max(1, API_WORKERS_ITEM_OFFERS), thread_name_prefix="item-offers"
+            )
+    return _item_offers_executor
+
+
+def _offer_country_id(offer: Dict[str, Any]) -> Optional[int]:
+    country_id = offer.get("country_id")
+    if country_id is None:
+        country = offer.get("country")
+        if isinstance(country, dict):
+            country_id = country.get("id")
+    return _to_int(country_id)
+
+
+def _fetch_item_offers_bulk(
+    countries: Dict[int, Dict[str, Any]],
+    item_id: int,
+    item_name: str
+) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+    """
+    Pobiera oferty towaru ze wszystkich krajów jednym zapytaniem i grupuje je po kraju.
+    
+    Zwraca None, jeśli API nie obsługuje zapytania bez country_id, oferty
+    nie zawierają informacji o kraju albo obejmują najwyżej jeden kraj
+    (API mogło przyjąć kraj domyślny lub zwrócić tylko część ofert).
+    """
+    res = fetch_data(f"market/items/get?item_id={item_id}", f"item prices {item_name} in all countries")
+    if not res or res.get("code") != 200 or not isinstance(res.get("data"), list):
+        return None
+    
+    # Klucze countries bywają int (economy_service) albo str (country_map strategii);
+    # oferty grupowane są pod oryginalnymi kluczami, tak jak w ścieżce kraj po kraju
+    country_keys = {_to_int(cid): cid for cid in countries}
+    offers_by_country: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    seen_country_ids = set()
+    for offer in res["data"]:
+        country_id = _offer_country_id(offer)
+        if country_id is None:
+            return None
+        seen_country_ids.add(country_id)
+        key = country_keys.get(country_id)
+        if key is not None:
+            offers_by_country[key].append(offer)
+    
+    if len(countries) > 1 and len(seen_country_ids) <= 1:
+        return None
+    return dict(offers_by_country)
+
+
+def _try_item_offers_bulk(
+    countries: Dict[int, Dict[str, Any]],
+    item_id: int,
+    item_name: str
+) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+    try:
+        return _fetch_item_offers_bulk(countries, item_id, item_name)
+    except Exception as e:
+        print(f"Error fetching prices for item {item_name} from all countries: {e}")
+        return None
+
+
+def _fetch_item_offers_in_country(
+    country_id: int,
+    country_info: Dict[str, Any],
+    item_id: int,
+    item_name: str
+) -> Optional[List[Dict[str, Any]]]:
+    try:
+        # Pobierz ceny towaru w danym kraju
+        url = f"market/items/get?country_id={country_id}&item_id={item_id}"
+        res = fetch_data(url, f"item price {item_name} in country{country_info.get('name', country_id)}")
+        
+        if res and res.get("code") == 200:
+            return res.get("data", []) or None
+    except Exception as e:
+        print(f"Error fetching prices for item {item_name} from country {country_id}: {e}")
+    return None
+
+
+def _fetch_item_offers(
+    countries: Dict[int, Dict[str, Any]],
+    items: Dict[int, str]
+) -> Dict[int, Dict[int, List[Dict[str, Any]]]]:
+    """
+    Pobiera surowe oferty rynkowe dla każdej pary (towar, kraj).
+    
+    Jeśli API obsługuje zapytanie o towar bez country_id, wystarcza jedno zapytanie
+    na towar; w przeciwnym razie (sprawdzane raz na proces) pobiera oferty kraj po kraju.
+    Zapytania wykonywane są równolegle, najwyżej API_WORKERS_ITEM_OFFERS naraz.
+    """
+    global _bulk_item_offers_supported
+    offers_by_item: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+    remaining = list(items.items())
+    per_country_items: List[Tuple[int, str]] = []
+    
+    executor = _get_item_offers_executor()
+    # Sprawdzenie pod blokadą - równoległe wywołania czekają na jeden wynik zamiast sprawdzać osobno
+    with _bulk_item_offers_lock:
+        if _bulk_item_offers_supported is None and remaining:
+            # Pierwszy towar sprawdza, czy API zwraca oferty ze wszystkich krajów naraz
+            item_id, item_name = remaining.pop(0)
+            bulk_offers = _try_item_offers_bulk(countries, item_id, item_name)
+            if bulk_offers is not None:
+                _bulk_item_offers_supported = True
+                offers_by_item[item_id] = bulk_offers
+            else:
+                print("⚠️ Bulk market offers not supported by API, fetching per country")
+                _bulk_item_offers_supported = False
+                per_country_items.append((item_id, item_name))
+        bulk_supported = _bulk_item_offers_supported
+    
+    if bulk_supported:
+        bulk_futures = [
+            (item_id, item_name, executor.submit(_try_item_offers_bulk, countries, item_id, item_name))
+            for item_id, item_name in remaining
+        ]
+        for item_id, item_name, future in bulk_futures:
+            bulk_offers = future.result()
+            if bulk_offers is not None:
+                offers_by_item[item_id] = bulk_offers
+            else:
+                per_country_items.append((item_id, item_name))
+    else:
+        per_country_items.extend(remaining)
+    
+    country_futures = [
+        (item_id, country_id, executor.submit(_fetch_item_offers_in_country, country_id, country_info, item_id, item_name))
+        for item_id, item_name in per_country_items
+        for country_id, country_info in countries.items()
+    ]
+    for item_id, _ in per_country_items:
+        offers_by_item[item_id] = {}
+    for item_id, country_id, future in country_futures:
+        offers = future.result()
+        if offers:
+            offers_by_item[item_id][country_id] = offers
+    
+    return offers_by_item
+
+
+def _select_cheapest_items(
+    countries: Dict[int, Dict[str, Any]],
+    items: Dict[int, str],
+    offers_by_item: Dict[int, Dict[int, List[Dict[str, Any]]]],
+    currency_rates: Dict[int, float],
+    gold_id: int
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Wybiera najtańsze oferty każdego towaru z pobranych ofert (bez zapytań do API)"""
+    from src.data.database.models import get_item_price_avg
+    
+    cheapest_items = {}
+    country_rates = _build_country_gold_rates(countries, currency_rates, gold_id)
+    
     for item_id, item_name in items.items():
-        all_items_for_type = []
+        # Kandydaci jako krotki: (cena min. w GOLD, kraj, cena min. w walucie, ilość, kurs, oferty)
+        candidates = []
         
-        for country_id, country_info in countries.items():
-            try:
-                # Pobierz ceny towaru w danym kraju
-                url = f"market/items/get?country_id={country_id}&item_id={item_id}"
-                res = fetch_data(url, f"item price {item_name} in country{country_info.get('name', country_id)}")
-                
-                if res and res.get("code") == 200:
-                    offers = res.get("data", [])
-                    if offers:
-                        # Parsuj oferty: (cena w walucie, ilość)
-                        parsed = []
-                        for offer in offers:
-                            price = offer.get("value")
-                            amount = offer.get("amount")
-                            try:
-                                price_f = float(price)
-                            except Exception:
-                                continue
-                            try:
-                                amount_i = int(amount) if amount is not None else 0
-                            except Exception:
-                                amount_i = 0
-                            parsed.append((price_f, amount_i))
-
-                        if not parsed:
-                            continue
-
-                        parsed.sort(key=lambda x: x[0])
-                        min_price_currency = parsed[0][0]
-                        amount_at_min = sum(a for p, a in parsed if p == min_price_currency)
-
-                        # Kurs GOLD dla waluty kraju
-                        currency_id = country_info.get("currency_id")
-                        if currency_id == gold_id:
-                            rate = 1.0
-                        else:
-                            rate = currency_rates.get(currency_id)
-                        if not rate or rate <= 0:
-                            continue
-
-                        # Średnia z ostatnich 5 dni z bazy danych
-                        from src.data.database.models import get_item_price_avg
-                        avg5_gold = get_item_price_avg(item_id, days=5)
-                        
-                        # Fallback: jeśli brak danych historycznych, użyj średniej z aktualnych ofert
-                        if avg5_gold is None:
-                            top5 = parsed[:5]
-                            avg5_gold = sum(p * rate for p, _ in top5) / len(top5)
-
-                        # Minimalna cena w GOLD
-                        min_price_gold = min_price_currency * rate
-
-                        item_data = {
-                            "item_id": item_id,
-                            "item_name": item_name,
-                            "country_id": country_id,
-                            "country": country_info.get("name", f"Country {country_id}"),
-                            "price_currency": min_price_currency,
-                            "currency_id": currency_id,
-                            "currency_name": country_info.get("currency_name", f"Currency {currency_id}"),
-                            "price_gold": min_price_gold,
-                            "amount": amount_at_min,
-                            "avg5_in_gold": round(avg5_gold, 6),
-                        }
-                        all_items_for_type.append(item_data)
-                                    
-            except Exception as e:
-                print(f"Error fetching prices for item {item_name} from country {country_id}: {e}")
+        for country_id, offers in offers_by_item.get(item_id, {}).items():
+            # Kurs GOLD jest stały dla wszystkich ofert z danego kraju
+            rate = country_rates.get(country_id)
+            if rate is None:
                 continue
+            # Parsuj oferty: (cena w walucie, ilość) i śledź minimum w tym samym przebiegu
+            parsed = []
+            min_price_currency = math.inf
+            amount_at_min = 0
+            for offer in offers:
+                price_f = _to_float(offer.get("value"))
+                if price_f is None:
+                    continue
+                amount_i = _to_int(offer.get("amount")) or 0
+                parsed.append((price_f, amount_i))
+                if price_f < min_price_currency:
+                    min_price_currency = price_f
+                    amount_at_min = amount_i
+                elif price_f == min_price_currency:
+                    amount_at_min += amount_i
+
+            if parsed:
+                candidates.append((min_price_currency * rate, country_id, min_price_currency, amount_at_min, rate, parsed))
         
-        # Sortuj wszystkie towary tego typu według ceny w GOLD i weź więcej najtańszych
-        if all_items_for_type:
-            all_items_for_type.sort(key=lambda x: x["price_gold"])
-            # Weź minimum 10, maksimum 20 najtańszych
-            num_items = min(20, max(10, len(all_items_for_type)))
-            cheapest_items[item_id] = all_items_for_type[:num_items]
+        if not candidates:
+            continue
+        
+        # Top-k najtańszych krajów bez sortowania całej listy; słowniki tylko dla wybranych
+        top = heapq.nsmallest(CHEAPEST_ITEMS_PER_TYPE, candidates, key=itemgetter(0))
+        
+        try:
+            # Średnia z ostatnich 5 dni z bazy danych (zależy tylko od towaru)
+            avg5_history = get_item_price_avg(item_id, days=5)
+        except Exception as e:
+            print(f"Error processing prices for item {item_name}: {e}")
+            continue
+        
+        selected = []
+        for min_price_gold, country_id, min_price_currency, amount_at_min, rate, parsed in top:
+            avg5_gold = avg5_history
+            # Fallback: jeśli brak danych historycznych, użyj średniej z aktualnych ofert
+            if avg5_gold is None:
+                top5 = heapq.nsmallest(5, parsed, key=itemgetter(0))
+                avg5_gold = sum(p * rate for p, _ in top5) / len(top5)
+            
+            country_info = countries[country_id]
+            currency_id = country_info.get("currency_id")
+            selected.append({
+                "item_id": item_id,
+                "item_name": item_name,
+                "country_id": country_id,
+                "country": country_info.get("name", f"Country {country_id}"),
+                "price_currency": min_price_currency,
+                "currency_id": currency_id,
+                "currency_name": country_info.get("currency_name", f"Currency {currency_id}"),
+                "price_gold": min_price_gold,
+                "amount": amount_at_min,
+                "avg5_in_gold": round(avg5_gold, 6),
+            })
+        cheapest_items[item_id] = selected
     
-    print(f"DEBUG: Finished fetching cheapest goods. Found {len(cheapest_items)} item types")
     return cheapest_items
 
 
@@ -407,18 +677,11 @@ def fetch_currency_offers(
         normalized_offers = []
         
         for offer in offers:
-            rate = offer.get("rate")
-            amount = offer.get("amount")
-            owner = offer.get("owner", {})
-            
-            try:
-                rate_f = float(rate) if rate is not None else None
-                amount_i = int(amount) if amount is not None else None
-            except (ValueError, TypeError):
-                continue
-            
+            rate_f = _to_float(offer.get("rate"))
+            amount_i = _to_int(offer.get("amount"))
             if rate_f is None or amount_i is None:
                 continue
+            owner = offer.get("owner", {})
                 
             normalized_offers.append({
                 "rate": rate_f,
@@ -469,39 +732,53 @@ def get_lowest_npc_wage_countries(currency_rates: Dict[int, float], countries_in
     if not npc_wage_data:
         return []
     
+    country_rates = _build_country_gold_rates(countries_info, currency_rates)
     countries_with_gold_wage = []
     
     for country in npc_wage_data:
         country_id = country["id"]
-        country_name = country["name"]
         npc_wage_local = country["value"]
         
         if npc_wage_local <= 0:
             continue
         
-        country_info = countries_info.get(country_id)
-        if not country_info:
+        currency_rate = country_rates.get(country_id)
+        if currency_rate is None:
             continue
-            
-        currency_id = country_info.get("currency_id")
-        if not currency_id:
-            continue
-            
-        currency_rate = currency_rates.get(currency_id, 0)
-        if currency_rate <= 0:
-            continue
-            
+        
+        country_info = countries_info[country_id]
+        currency_id = country_info["currency_id"]
         npc_wage_gold = npc_wage_local * currency_rate
         
         countries_with_gold_wage.append({
-            "country_name": country_name,
+            "country_name": country["name"],
             "npc_wage_local": npc_wage_local,
             "currency_name": country_info.get("currency_name", f"Currency {currency_id}"),
             "currency_code": country_info.get("currency_code", ""),
             "npc_wage_gold": npc_wage_gold
         })
     
-    countries_with_gold_wage.sort(key=lambda x: x["npc_wage_gold"])
-    return countries_with_gold_wage[:5]
+    # Wybierz 5 najniższych bez sortowania całej listy
+    return heapq.nsmallest(5, countries_with_gold_wage, key=itemgetter("npc_wage_gold"))
 
 
+def _build_country_gold_rates(
+    countries: Dict[int, Dict[str, Any]],
+    currency_rates: Dict[int, float],
+    gold_id: Optional[int] = None
+) -> Dict[int, float]:
+    """
+    Mapuje ID kraju na kurs jego waluty względem GOLD.
+    
+    Liczone raz na raport zamiast przy każdej ofercie; kraje bez waluty
+    lub bez dodatniego kursu są pomijane.
+    """
+    country_rates: Dict[int, float] = {}
+    for country_id, country_info in countries.items():
+        currency_id = country_info.get("currency_id")
+        if currency_id is None:
+            continue
+        rate = 1.0 if currency_id == gold_id else currency_rates.get(currency_id)
+        if rate and rate > 0:
+            country_rates[country_id] = rate
+    return country_rates
@@ -96,8 +96,13 @@ def build_wars_summary(raw_data_from_file: Dict[str, Any], country_map: Dict[int
     finished: List[str] = []
 
     from datetime import datetime as _dt
+    seen_war_ids = set()
     for w in wars_list:
-        war_id = w.get('id')
+        # API może zwrócić tę samą wojnę więcej niż raz - przetwarzaj każde ID raz
+        if (war_id := w.get('id')) is not None:
+            if war_id in seen_war_ids:
+                continue
+            seen_war_ids.add(war_id)
         atk_name = None
         def_name = None
         try:
@@ -4,30 +4,61 @@ Szybki kalkulator produktywności - wersja uproszczona
 Pozwala szybko przetestować różne scenariusze bez interaktywnego interfejsu
 """
 
+from functools import lru_cache
+from typing import List
+
+from src.data.database.models import load_regions_data
 from src.reports.generators.production_report import ProductionAnalyzer
 
+# Produkty do wyboru w trybie interaktywnym i gotowa lista do wyświetlenia
+_PRODUCTS = ("grain", "iron", "titanium", "fuel", "food", "weapon", "aircraft", "airplane ticket")
+_PRODUCTS_BANNER = "\n".join(f"{i:2d}. {product}" for i, product in enumerate(_PRODUCTS, 1))
 
-def quick_calculate(region_name: str, country_name: str, item_name: str, 
-                   company_tier: int = 5, eco_skill: int = 16, 
-                   workers_today: int = 0, is_npc_owned: bool = False,
-                   military_base_level: int = 0, building_level: int = 0,
-                   is_on_sale: bool = False):
-    """
-    Szybkie obliczenie produkcji dla podanych parametrów
-    """
-    
-    # Spróbuj pobrać rzeczywiste dane z bazy
-    from src.data.database.models import load_regions_data
-    
-    regions_data, summary = load_regions_data()
-    region_data = None
-    
-    # Znajdź region w rzeczywistych danych
-    for region in regions_data:
-        if (region['region_name'].lower() == region_name.lower() and 
-            region['country_name'].lower() == country_name.lower()):
-            region_data = region
-            break
+
+@lru_cache(maxsize=1)
+def _get_analyzer() -> ProductionAnalyzer:
+    """Analizator z wczytanymi płacami NPC - tworzony raz dla wszystkich scenariuszy"""
+    analyzer = ProductionAnalyzer()
+    analyzer.load_npc_wages_data()
+    return analyzer
+
+
+@lru_cache(maxsize=1)
+def _load_regions():
+    """Dane regionów z bazy - wczytywane raz dla wszystkich scenariuszy"""
+    return load_regions_data()
+
+
+@lru_cache(maxsize=1)
+def _region_index():
+    """Indeks regionów po (nazwa regionu, nazwa kraju) małymi literami; pierwszy wpis wygrywa"""
+    index = {}
+    for region in _load_regions()[0]:
+        index.setdefault((region['region_name'].lower(), region['country_name'].lower()), region)
+    return index
+
+
+@lru_cache(maxsize=1)
+def _region_name_index():
+    """Regiony pogrupowane po nazwie regionu małymi literami (dokładne dopasowanie w trybie interaktywnym)"""
+    index = {}
+    for region in _load_regions()[0]:
+        index.setdefault(region['region_name'].lower(), []).append(region)
+    return index
+
+
+@lru_cache(maxsize=1)
+def _region_search_keys():
+    """Nazwy regionu i kraju małymi literami policzone raz dla wyszukiwania podciągów"""
+    return [
+        (region['region_name'].lower(), region['country_name'].lower(), region)
+        for region in _load_regions()[0]
+    ]
+
+
+def _find_region(region_name: str, country_name: str):
+    """Znajduje region w danych z bazy lub zwraca dane domyślne"""
+    region_data = _region_index().get((region_name.lower(), country_name.lower()))
     
     # Jeśli nie znaleziono, użyj domyślnych danych
     if not region_data:
@@ -47,13 +78,15 @@ def quick_calculate(region_name: str, country_name: str, item_name: str,
                 'TICKETS': 0.0
             }
         }
-    
-    # Inicjalizuj analizator
-    analyzer = ProductionAnalyzer()
-    analyzer.load_npc_wages_data()
-    
-    # Oblicz produkcję
-    production_data = analyzer.calculate_production_efficiency(
+    return region_data
+
+
+def _calculate_and_print(region_data, region_name: str, country_name: str, item_name: str,
+                         company_tier: int, eco_skill: int, workers_today: int, is_npc_owned: bool,
+                         military_base_level: int, building_level: int, is_on_sale: bool):
+    """Oblicza produkcję dla jednego zestawu parametrów i wypisuje wynik"""
+    # Analizator współdzielony między wywołaniami
+    production_data = _get_analyzer().calculate_production_efficiency(
         region_data, item_name,
         company_tier=company_tier,
         eco_skill=eco_skill,
@@ -78,14 +111,56 @@ def quick_calculate(region_name: str, country_name: str, item_name: str,
         print(f"❌ Calculation error for {region_name} - {item_name}")
 
 
+def quick_calculate(region_name: str, country_name: str, item_name: str, 
+                   company_tier: int = 5, eco_skill: int = 16, 
+                   workers_today: int = 0, is_npc_owned: bool = False,
+                   military_base_level: int = 0, building_level: int = 0,
+                   is_on_sale: bool = False):
+    """
+    Szybkie obliczenie produkcji dla podanych parametrów
+    """
+    region_data = _find_region(region_name, country_name)
+    _calculate_and_print(region_data, region_name, country_name, item_name,
+                         company_tier, eco_skill, workers_today, is_npc_owned,
+                         military_base_level, building_level, is_on_sale)
+
+
+def quick_calculate_batch(region_name: str, country_name: str, items: List[str],
+                          tiers: List[int], eco_skill: int = 16,
+                          workers_today: int = 0, is_npc_owned: bool = False,
+                          military_base_level: int = 0, building_level: int = 0,
+                          is_on_sale: bool = False):
+    """
+    Oblicza produkcję dla wszystkich par (towar, tier) w jednym regionie.
+    Region wyszukiwany jest raz dla całej serii.
+    """
+    region_data = _find_region(region_name, country_name)
+    for item_name in items:
+        for company_tier in tiers:
+            _calculate_and_print(region_data, region_name, country_name, item_name,
+                                 company_tier, eco_skill, workers_today, is_npc_owned,
+                                 military_base_level, building_level, is_on_sale)
+
+
+def _ask_int(prompt: str, default: int) -> int:
+    """Pyta o liczbę całkowitą; pusta odpowiedź daje wartość domyślną, błędna - domyślną z ostrzeżeniem"""
+    answer = input(prompt).strip()
+    if not answer:
+        return default
+    try:
+        return int(answer)
+    except ValueError:
+        print(f"❌ Invalid input, using default value {default}")
+        return default
+
+
 def interactive_quick_calculate():
     """Interactive quick calculator with region name input"""
     print("🚀 INTERACTIVE QUICK PRODUCTIVITY CALCULATOR")
     print("=" * 60)
     
     # Load regions data
-    from src.data.database.models import load_regions_data
-    regions_data, summary = load_regions_data()
+    regions_data, summary = _load_regions()
     
     if not regions_data:
         print("❌ No region data available")
@@ -126,18 +201,21 @@ def interactive_quick_calculate():
                     continue
             except ValueError:
                 # Not a number, try to find by name
-                found_regions = []
                 choice_lower = choice.lower()
                 
-                for region in regions_data:
-                    region_name_lower = region['region_name'].lower()
-                    country_name_lower = region['country_name'].lower()
-                    
-                    # Check if input matches region name or country name
-                    if (choice_lower in region_name_lower or 
-                        choice_lower in country_name_lower or
-                        region_name_lower in choice_lower):
-                        found_regions.append(region)
+                # Fast path: exact, unique region name
+                found_regions = _region_name_index().get(choice_lower, [])
+                if len(found_regions) != 1:
+                    # Check if input matches region name or country name; a region name can
+                    # only be contained in the input when it is shorter than the input
+                    choice_len = len(choice_lower)
+                    found_regions = [
+                        region
+                        for region_name_lower, country_name_lower, region in _region_search_keys()
+                        if (choice_lower in region_name_lower or
+                            choice_lower in country_name_lower or
+                            (len(region_name_lower) < choice_len and region_name_lower in choice_lower))
+                    ]
                 
                 if len(found_regions) == 1:
                     selected_region = found_regions[0]
@@ -174,43 +252,34 @@ def interactive_quick_calculate():
             
             # Get product selection
             print("\n📦 Available products:")
-            products = ["grain", "iron", "titanium", "fuel", "food", "weapon", "aircraft", "airplane ticket"]
-            for i, product in enumerate(products, 1):
-                print(f"{i:2d}. {product}")
+            print(_PRODUCTS_BANNER)
             
             while True:
                 try:
-                    product_choice = input(f"\nSelect product (1-{len(products)}): ").strip()
+                    product_choice = input(f"\nSelect product (1-{len(_PRODUCTS)}): ").strip()
                     product_num = int(product_choice)
-                    if 1 <= product_num <= len(products):
-                        item_name = products[product_num - 1]
+                    if 1 <= product_num <= len(_PRODUCTS):
+                        item_name = _PRODUCTS[product_num - 1]
                         print(f"✅ Selected: {item_name}")
                         break
                     else:
-                        print(f"❌ Select number from 1 to {len(products)}")
+                        print(f"❌ Select number from 1 to {len(_PRODUCTS)}")
                 except ValueError:
                     print("❌ Enter a valid number")
             
             # Get company parameters
             print("\n🏢 Company Parameters:")
-            try:
-                company_tier = int(input("Company tier (1-5, default 5): ").strip() or "5")
-                eco_skill = int(input("Eco skill (0-100, default 16): ").strip() or "16")
-                workers_today = int(input("Workers today (0-100, default 0): ").strip() or "0")
-                military_base_level = int(input("Military base level (0-5, default 0): ").strip() or "0")
-                building_level = int(input("Building level (0-5, default 0): ").strip() or "0")
-                
-                is_npc_owned_input = input("NPC owned? (y/n, default n): ").strip().lower()
-                is_npc_owned = is_npc_owned_input in ['y', 'yes', 't', 'tak']
-                
-                is_on_sale_input = input("On sale? (y/n, default n): ").strip().lower()
-                is_on_sale = is_on_sale_input in ['y', 'yes', 't', 'tak']
-                
-            except ValueError:
-                print("❌ Invalid input, using default values")
-                company_tier, eco_skill, workers_today = 5, 16, 0
-                military_base_level, building_level = 0, 0
-                is_npc_owned, is_on_sale = False, False
+            company_tier = _ask_int("Company tier (1-5, default 5): ", 5)
+            eco_skill = _ask_int("Eco skill (0-100, default 16): ", 16)
+            workers_today = _ask_int("Workers today (0-100, default 0): ", 0)
+            military_base_level = _ask_int("Military base level (0-5, default 0): ", 0)
+            building_level = _ask_int("Building level (0-5, default 0): ", 0)
+            
+            is_npc_owned_input = input("NPC owned? (y/n, default n): ").strip().lower()
+            is_npc_owned = is_npc_owned_input in ['y', 'yes', 't', 'tak']
+            
+            is_on_sale_input = input("On sale? (y/n, default n): ").strip().lower()
+            is_on_sale = is_on_sale_input in ['y', 'yes', 't', 'tak']
             
             # Calculate production
             print(f"\n🔄 Calculating production for {region_name} ({country_name}) - {item_name}...")
@@ -276,15 +345,13 @@ def main():
     
     # Scenariusz 6: Różne produkty
     print("📊 SCENARIO 6: Different products")
-    for item in ["weapon", "iron", "grain", "aircraft"]:
-        quick_calculate("Hurghada", "Slovenia", item, 
-                       company_tier=5, eco_skill=16, workers_today=0)
+    quick_calculate_batch("Hurghada", "Slovenia", ["weapon", "iron", "grain", "aircraft"],
+                          tiers=[5], eco_skill=16, workers_today=0)
     
     # Scenariusz 7: Różne poziomy firm
     print("📊 SCENARIO 7: Different company levels")
-    for tier in [1, 3, 5]:
-        quick_calculate("Hurghada", "Slovenia", "weapon", 
-                       company_tier=tier, eco_skill=16, workers_today=0)
+    quick_calculate_batch("Hurghada", "Slovenia", ["weapon"],
+                          tiers=[1, 3, 5], eco_skill=16, workers_today=0)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,44 @@
+import heapq
+import threading
 from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import os
+from itertools import chain
+from operator import itemgetter
 
-from src.data.api.client import fetch_data
-from config.settings.base import GOLD_ID_FALLBACK
+from src.data.api.executor import get_io_executor
+from src.data.api.request_loader import RequestLoader
+from src.data.api.response_cache import cached_fetch_data
+from config.settings.base import GOLD_ID_FALLBACK, API_CACHE_TTL_REGIONS, API_LOADER_TTL_SECONDS, REGIONS_DEBUG
+
+
+# Strzałka zmiany wartości według znaku różnicy (nowa - stara)
+CHANGE_ARROWS = {1: "↑", -1: "↓", 0: "→"}
+_UNCHANGED_REGION = {"pollution_change": "→", "bonus_change": "→", "population_change": "→"}
+
+# Jedna współdzielona instancja napisu na typ bonusu (wszystkie regiony odwołują się do tych
+# samych obiektów, a porównania kluczy w bonus_by_type kończą się na porównaniu tożsamości)
+_BONUS_TYPE_NAMES: Dict[Any, Any] = {
+    name: name
+    for name in ("GRAIN", "IRON", "TITANIUM", "OIL", "FUEL", "FOOD", "WEAPONS", "WEAPON", "AIRCRAFT", "TICKETS")
+}
+
+# Typy bonusów paliwowych (we wszystkich spotykanych wielkościach liter) dla diagnostyki
+_OIL_TYPES = frozenset(
+    variant
+    for name in ("OIL", "FUEL", "PALIWO")
+    for variant in (name, name.lower(), name.capitalize())
+)
+
+
+def _intern_bonus_type(bonus_type: Any) -> Any:
+    """Zwraca współdzieloną instancję nazwy typu bonusu"""
+    return _BONUS_TYPE_NAMES.setdefault(bonus_type, bonus_type)
 
 
 def fetch_regions_for_country(country_id: int) -> List[Dict[str, Any]]:
     """
     Pobiera regiony dla konkretnego kraju.
+    Równoległe zapytania o ten sam kraj (np. z kilku strategii naraz) są łączone w jedno.
     
     Args:
         country_id: ID kraju
@@ -17,125 +46,206 @@ def fetch_regions_for_country(country_id: int) -> List[Dict[str, Any]]:
     Returns:
         Lista regionów z danego kraju
     """
+    regions = _regions_loader.load(country_id)
+    return regions if regions is not None else []
+
+
+def _fetch_regions_for_country(country_id: int) -> Optional[List[Dict[str, Any]]]:
+    """Pobiera regiony kraju z API; None przy błędzie (nie jest zapamiętywane)"""
     try:
         url = f"country/regions?country_id={country_id}"
-        response = fetch_data(url, f"regionach kraju {country_id}")
+        response = cached_fetch_data(url, f"regionach kraju {country_id}", API_CACHE_TTL_REGIONS)
         
         if response and response.get("code") == 200:
             return response.get("data", [])
-        return []
     except Exception as e:
         print(f"Error fetching regions for country {country_id}: {e}")
-        return []
+    return None
+
+
+_regions_loader = RequestLoader(_fetch_regions_for_country, ttl_seconds=API_LOADER_TTL_SECONDS)
+
+
+# Czy API zwraca regiony wszystkich krajów jednym zapytaniem (None = jeszcze nie sprawdzono)
+_bulk_regions_supported: Optional[bool] = None
+_bulk_regions_lock = threading.Lock()
+
+
+def _country_id_key(country_id: Any) -> Optional[int]:
+    """Normalizuje ID kraju (int lub str) do int; None, jeśli nie jest liczbą"""
+    try:
+        return int(country_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fetch_all_regions_bulk(eco_countries: Dict[int, Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Pobiera regiony wszystkich krajów jednym zapytaniem (country/regions bez country_id).
+    
+    Zwraca None, jeśli API nie obsługuje takiego zapytania, regiony nie zawierają
+    informacji o kraju albo odpowiedź obejmuje tylko jeden kraj (API mogło przyjąć kraj domyślny).
+    """
+    response = cached_fetch_data("country/regions", "regionach wszystkich krajów", API_CACHE_TTL_REGIONS)
+    if not response or response.get("code") != 200 or not isinstance(response.get("data"), list):
+        return None
+    
+    # Klucze eco_countries bywają int (economy_service) albo str (country_map strategii)
+    wanted_ids = {_country_id_key(cid) for cid in eco_countries}
+    regions = []
+    seen_country_ids = set()
+    for region in response["data"]:
+        country_id = _country_id_key(region.get("country_id"))
+        if country_id is None:
+            return None
+        seen_country_ids.add(country_id)
+        if country_id in wanted_ids or _country_id_key(region.get("original_country_id")) in wanted_ids:
+            regions.append(region)
+    
+    if len(eco_countries) > 1 and len(seen_country_ids) <= 1:
+        return None
+    # Żaden region nie pasuje do żądanych krajów - nie traktuj tego jako obsługi zapytania zbiorczego
+    if eco_countries and not regions:
+        return None
+    return regions
+
+
+def _try_all_regions_bulk(eco_countries: Dict[int, Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Zwraca regiony wszystkich krajów z jednego zapytania lub None, gdy się nie udało"""
+    try:
+        return _fetch_all_regions_bulk(eco_countries)
+    except Exception as e:
+        print(f"Error fetching regions for all countries: {e}")
+        return None
 
 
 def fetch_all_regions_with_bonuses(eco_countries: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Pobiera wszystkie regiony ze wszystkich krajów (nie tylko z bonusami).
     
+    Jeśli API obsługuje zapytanie o regiony bez country_id, wystarcza jedno zapytanie;
+    w przeciwnym razie (sprawdzane raz na proces) pobiera regiony kraj po kraju.
+    
     Args:
         eco_countries: Słownik z informacjami o krajach
         
     Returns:
         Lista wszystkich regionów
     """
-    all_regions = []
-    max_workers = int(os.getenv("API_WORKERS_REGIONS", "8"))
+    global _bulk_regions_supported
+    # Sprawdzenie pod blokadą - równoległe wywołania czekają na jeden wynik zamiast sprawdzać osobno
+    with _bulk_regions_lock:
+        if _bulk_regions_supported is None:
+            bulk_regions = _try_all_regions_bulk(eco_countries)
+            if bulk_regions is not None:
+                _bulk_regions_supported = True
+                return bulk_regions
+            print("⚠️ Bulk regions not supported by API, fetching per country")
+            _bulk_regions_supported = False
+        bulk_supported = _bulk_regions_supported
     
-    def fetch_country_regions(country_id: int) -> List[Dict[str, Any]]:
-        regions = fetch_regions_for_country(country_id)
-        # Zwróć wszystkie regiony (nie tylko z bonusami)
-        return regions
+    if bulk_supported:
+        bulk_regions = _try_all_regions_bulk(eco_countries)
+        if bulk_regions is not None:
+            return bulk_regions
     
-    # Parallel fetching of regions for all countries
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fetch_country_regions, cid): cid for cid in eco_countries.keys()}
-        
-        for future in as_completed(futures):
-            try:
-                country_regions = future.result()
-                all_regions.extend(country_regions)
-            except Exception as e:
-                country_id = futures[future]
-                print(f"Error fetching regions for country {country_id}: {e}")
+    # Parallel fetching of regions for all countries (shared I/O pool); fetch_regions_for_country
+    # zwraca [] przy błędzie, więc wyniki można zbierać przez map() bez słownika futures
+    executor = get_io_executor()
     
-    return all_regions
+    # Zwróć wszystkie regiony (nie tylko z bonusami); listy łączone raz na końcu
+    return list(chain.from_iterable(executor.map(fetch_regions_for_country, eco_countries.keys())))
 
 
-def process_regions_data(regions: List[Dict[str, Any]], eco_countries: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+def process_regions_data(regions: List[Dict[str, Any]], eco_countries: Dict[int, Dict[str, Any]],
+                         top_k: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Przetwarza dane regionów i przygotowuje je do wyświetlenia w tabeli.
     
     Args:
         regions: Lista regionów z bonusami
         eco_countries: Słownik z informacjami o krajach
+        top_k: Jeśli podane, zwraca tylko top_k regionów z najniższym pollution
+            (bez sortowania całej listy)
         
     Returns:
         Lista przetworzonych regionów gotowa do wyświetlenia
     """
     processed_regions = []
+    append_region = processed_regions.append
+    # Płaska mapa id -> nazwa kraju budowana raz zamiast dwóch odczytów na region
+    eco_names = {cid: country.get("name", "Unknown") for cid, country in eco_countries.items()}
     
     for region in regions:
-        country_id = region.get("country_id")
-        original_country_id = region.get("original_country_id")
+        # Lokalny alias metody - kilkanaście odczytów pól na region bez ponownego wyszukiwania .get
+        get = region.get
+        
+        # Pola używane kilkukrotnie odczytywane raz
+        region_name = get("region_name", get("name", "Unknown"))
+        bonuses = get("bonus", [])
+        country_id = get("country_id")
+        original_country_id = get("original_country_id")
         
         # Pobierz nazwę kraju - spróbuj najpierw country_id, potem original_country_id
         country_name = "Unknown"
-        if country_id and country_id in eco_countries:
-            country_name = eco_countries[country_id].get("name", "Unknown")
-        elif original_country_id and original_country_id in eco_countries:
-            country_name = eco_countries[original_country_id].get("name", "Unknown")
+        if country_id and country_id in eco_names:
+            country_name = eco_names[country_id]
+        elif original_country_id and original_country_id in eco_names:
+            country_name = eco_names[original_country_id]
         
         # Oblicz bonus_score (suma wszystkich bonusów) i przechowuj bonusy według typów
+        # Pary (typ, wartość) wyciągane raz; suma, mapa i opis liczone z nich bez ponownego get()
         bonus_score = 0
         bonus_description = ""
         bonus_by_type = {}  # Nowe: przechowuj bonusy według typów
-        if region.get("bonus"):
-            bonus_parts = []
-            for bonus in region["bonus"]:
-                bonus_type = bonus.get("type", "")
-                bonus_value = bonus.get("value", 0)
-                bonus_score += bonus_value
-                bonus_parts.append(f"{bonus_type}:{bonus_value}")
-                bonus_by_type[bonus_type] = bonus_value  # Przechowuj bonus według typu
-                
-                # ✅ DEBUG: Log oil/fuel bonus types from API
-                if bonus_type.upper() in ['OIL', 'FUEL', 'PALIWO']:
-                    region_name = region.get("region_name", region.get("name", "Unknown"))
-                    print(f"🔍 DEBUG: Found {bonus_type} bonus in region {region_name}: {bonus_value}%")
-                
-                # ✅ DEBUG: Log all bonus types for first few regions to understand API format
-                if len(processed_regions) < 5:  # Only for first 5 regions
-                    region_name = region.get("region_name", region.get("name", "Unknown"))
-                    print(f"🔍 DEBUG: Region {region_name} has bonus type: {bonus_type} = {bonus_value}%")
+        if bonuses:
+            bonus_pairs = [
+                (_intern_bonus_type(bonus.get("type", "")), bonus.get("value", 0))
+                for bonus in bonuses
+            ]
+            # Sumowanie po krotce wartości odbywa się w C, bez generatora na każdy region
+            _, bonus_values = zip(*bonus_pairs)
+            bonus_score = sum(bonus_values)
+            bonus_by_type = dict(bonus_pairs)  # Przechowuj bonus według typu
+            bonus_description = " ".join(f"{bonus_type}:{bonus_value}" for bonus_type, bonus_value in bonus_pairs)
             
-            bonus_description = " ".join(bonus_parts)
+            if REGIONS_DEBUG:
+                for bonus_type, bonus_value in bonus_pairs:
+                    # ✅ DEBUG: Log oil/fuel bonus types from API
+                    if bonus_type in _OIL_TYPES:
+                        print(f"🔍 DEBUG: Found {bonus_type} bonus in region {region_name}: {bonus_value}%")
+                    
+                    # ✅ DEBUG: Log all bonus types for first few regions to understand API format
+                    if len(processed_regions) < 5:  # Only for first 5 regions
+                        print(f"🔍 DEBUG: Region {region_name} has bonus type: {bonus_type} = {bonus_value}%")
         
         # Oblicz bonus_per_pollution
-        pollution = region.get("pollution", 0)
+        pollution = get("pollution", 0)
         bonus_per_pollution = round(bonus_score / pollution, 2) if pollution > 0 else 0
         
         processed_region = {
-            "region_name": region.get("region_name", region.get("name", "Unknown")),
+            "region_name": region_name,
             "country_name": country_name,
             "country_id": country_id,
             "pollution": pollution,
             "bonus_score": bonus_score,
             "bonus_description": bonus_description,
             "bonus_by_type": bonus_by_type,  # Nowe: bonusy według typów
-            "population": region.get("population", 0),
-            "nb_npcs": region.get("nb_npcs", 0),
-            "type": region.get("type", 0),
+            "population": get("population", 0),
+            "nb_npcs": get("nb_npcs", 0),
+            "type": get("type", 0),
             "original_country_id": original_country_id,
             "bonus_per_pollution": bonus_per_pollution,
-            "factories": region.get("factories", {}),  # Zachowaj informacje o fabrykach
-            "bonus": region.get("bonus", [])  # Zachowaj oryginalne bonusy
+            "factories": get("factories", {}),  # Zachowaj informacje o fabrykach
+            "bonus": bonuses  # Zachowaj oryginalne bonusy
         }
         
-        processed_regions.append(processed_region)
+        append_region(processed_region)
     
     # Sortuj według pollution od najniższego do najwyższego
-    processed_regions.sort(key=lambda x: x["pollution"])
+    if top_k is not None:
+        return heapq.nsmallest(top_k, processed_regions, key=itemgetter("pollution"))
+    processed_regions.sort(key=itemgetter("pollution"))
     
     return processed_regions
 
@@ -154,13 +264,26 @@ def get_regions_summary(regions_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {}
     
     total_regions = len(regions_data)
-    total_bonus_score = sum(r["bonus_score"] for r in regions_data)
-    avg_pollution = sum(r["pollution"] for r in regions_data) / total_regions
-    avg_bonus_per_pollution = sum(r["bonus_per_pollution"] for r in regions_data) / total_regions
     
-    # Znajdź regiony z najwyższym i najniższym bonus_per_pollution
-    best_efficiency = max(regions_data, key=lambda x: x["bonus_per_pollution"])
-    worst_efficiency = min(regions_data, key=lambda x: x["bonus_per_pollution"])
+    # Jeden przebieg: sumy oraz regiony z najwyższym i najniższym bonus_per_pollution
+    # (przy remisie wygrywa pierwszy region, jak w max()/min())
+    total_bonus_score = 0
+    total_pollution = 0
+    total_bonus_per_pollution = 0
+    best_efficiency = worst_efficiency = regions_data[0]
+    best_score = worst_score = best_efficiency["bonus_per_pollution"]
+    for r in regions_data:
+        bonus_per_pollution = r["bonus_per_pollution"]
+        total_bonus_score += r["bonus_score"]
+        total_pollution += r["pollution"]
+        total_bonus_per_pollution += bonus_per_pollution
+        if bonus_per_pollution > best_score:
+            best_efficiency, best_score = r, bonus_per_pollution
+        elif bonus_per_pollution < worst_score:
+            worst_efficiency, worst_score = r, bonus_per_pollution
+    
+    avg_pollution = total_pollution / total_regions
+    avg_bonus_per_pollution = total_bonus_per_pollution / total_regions
     
     return {
         "total_regions": total_regions,
@@ -174,12 +297,14 @@ def get_regions_summary(regions_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def fetch_and_process_regions(eco_countries: Dict[int, Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def fetch_and_process_regions(eco_countries: Dict[int, Dict[str, Any]],
+                              top_k: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Główna funkcja do pobierania i przetwarzania danych o regionach.
     
     Args:
         eco_countries: Słownik z informacjami o krajach
+        top_k: Opcjonalny limit regionów (najniższe pollution), patrz process_regions_data
         
     Returns:
         Krotka (lista regionów, podsumowanie)
@@ -196,7 +321,7 @@ def fetch_and_process_regions(eco_countries: Dict[int, Dict[str, Any]]) -> Tuple
     print(f"Found {len(regions)} regions.")
     
     # Przetwórz dane
-    processed_regions = process_regions_data(regions, eco_countries)
+    processed_regions = process_regions_data(regions, eco_countries, top_k=top_k)
     
     # Utwórz podsumowanie
     summary = get_regions_summary(processed_regions)
@@ -218,50 +343,30 @@ def compare_regions_with_history(current_regions: List[Dict[str, Any]], historic
     if not historical_regions:
         return current_regions
     
-    # Utwórz mapę historycznych danych według region_name + country_id
-    historical_map = {}
-    for region in historical_regions:
-        key = f"{region['region_name']}_{region['country_id']}"
-        historical_map[key] = region
+    # Utwórz mapę historycznych danych według (region_name, country_id)
+    historical_map = {(r['region_name'], r['country_id']): r for r in historical_regions}
     
     # Dodaj wskaźniki zmian
     for region in current_regions:
-        key = f"{region['region_name']}_{region['country_id']}"
-        historical_region = historical_map.get(key)
+        historical_region = historical_map.get((region['region_name'], region['country_id']))
         
         if historical_region:
-            # Porównaj pollution
-            old_pollution = historical_region.get("pollution", 0)
             new_pollution = region.get("pollution", 0)
-            
-            if new_pollution > old_pollution:
-                region["pollution_change"] = "↑"
-            elif new_pollution < old_pollution:
-                region["pollution_change"] = "↓"
-            else:
-                region["pollution_change"] = "→"
-            
-            # Porównaj bonus_score
-            old_bonus = historical_region.get("bonus_score", 0)
+            old_pollution = historical_region.get("pollution", 0)
             new_bonus = region.get("bonus_score", 0)
-            
-            if new_bonus > old_bonus:
-                region["bonus_change"] = "↑"
-            elif new_bonus < old_bonus:
-                region["bonus_change"] = "↓"
-            else:
-                region["bonus_change"] = "→"
-            
-            # Porównaj population
-            old_population = historical_region.get("population", 0)
+            old_bonus = historical_region.get("bonus_score", 0)
             new_population = region.get("population", 0)
+            old_population = historical_region.get("population", 0)
+            
+            # Najczęstszy przypadek - region bez zmian: jedno update zamiast trzech porównań
+            if new_pollution == old_pollution and new_bonus == old_bonus and new_population == old_population:
+                region.update(_UNCHANGED_REGION)
+                continue
             
-            if new_population > old_population:
-                region["population_change"] = "↑"
-            elif new_population < old_population:
-                region["population_change"] = "↓"
-            else:
-                region["population_change"] = "→"
+            # Porównaj pollution, bonus_score i population: znak różnicy wybiera strzałkę
+            region["pollution_change"] = CHANGE_ARROWS[(new_pollution > old_pollution) - (new_pollution < old_pollution)]
+            region["bonus_change"] = CHANGE_ARROWS[(new_bonus > old_bonus) - (new_bonus < old_bonus)]
+            region["population_change"] = CHANGE_ARROWS[(new_population > old_population) - (new_population < old_population)]
         else:
             # Nowy region
             region["pollution_change"] = "🆕"
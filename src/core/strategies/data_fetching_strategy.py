@@ -5,21 +5,50 @@ Copyright (c) 2025 Teo693
 Licensed under the MIT License - see LICENSE file for details.
 """
 
+import json
+import os
+import sqlite3
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.core.services.base_service import ServiceDependencies
 from src.data.api.client import fetch_data
+from src.data.api.response_cache import cached_fetch_data
 from src.core.services.economy_service import (
-    build_currency_rates_map,
-    fetch_best_jobs_from_all_countries,
-    fetch_cheapest_items_from_all_countries,
     fetch_items_by_type,
+    fetch_rates_jobs_and_cheapest_items,
     compute_currency_extremes
 )
 from src.core.services.regions_service import fetch_and_process_regions
 from src.core.services.military_service import process_hits_data, build_wars_summary
+from config.settings.base import API_CACHE_TTL_COUNTRIES
+
+try:
+    import orjson
+
+    def _json_loads(text: Any) -> Any:
+        return orjson.loads(text)
+except ImportError:
+    def _json_loads(text: Any) -> Any:
+        return json.loads(text)
+
+
+# Sample warriors used until warrior data is stored in the database
+_SAMPLE_WARRIORS: Tuple[Dict[str, Any], ...] = (
+    {'username': 'SampleWarrior1', 'level': 15, 'points': 2500, 'nationality_id': '2'},  # UK
+    {'username': 'SampleWarrior2', 'level': 12, 'points': 2000, 'nationality_id': '3'},  # USA
+    {'username': 'SampleWarrior3', 'level': 18, 'points': 1800, 'nationality_id': '4'},  # Mexico
+    {'username': 'SampleWarrior4', 'level': 14, 'points': 1600, 'nationality_id': '5'},  # Colombia
+    {'username': 'SampleWarrior5', 'level': 16, 'points': 1400, 'nationality_id': '6'},  # Peru
+)
+
+
+def _now_iso() -> str:
+    """Get current timestamp"""
+    return datetime.now().isoformat()
 
 
 class DataFetchingStrategy(ABC):
@@ -100,7 +129,7 @@ class FullDataFetchingStrategy(DataFetchingStrategy):
                 # This would need to be implemented based on warriors repository
                 data['warriors'] = {}
             
-            data['fetched_at'] = self._get_current_timestamp()
+            data['fetched_at'] = _now_iso()
             
         except Exception as e:
             print(f"Error in Full Data Fetching Strategy: {e}")
@@ -110,42 +139,40 @@ class FullDataFetchingStrategy(DataFetchingStrategy):
     def get_strategy_name(self) -> str:
         return "Full Data Fetching"
     
-    def _get_current_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
-
 
 class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     """Strategy for optimized data fetching based on report type"""
     
+    def __init__(self, dependencies: ServiceDependencies):
+        super().__init__(dependencies)
+        self._conn_cache: Dict[str, sqlite3.Connection] = {}
+        # Wyniki repozytoriów w obrębie jednego wywołania fetch_data
+        self._req_cache: Dict[str, Any] = {}
+        # Długożyjąca pula na zadania w tle (regiony); wątki powstają dopiero przy pierwszym użyciu.
+        # Osobna od wspólnej puli I/O, bo zadania w tle same czekają na jej zadania.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, min(8, (os.cpu_count() or 4) * 2)),
+            thread_name_prefix="fetch"
+        )
+    
     def fetch_data(self, sections: Dict[str, bool], report_type: str) -> Dict[str, Any]:
         """Fetch only required data based on report type"""
         print(f"⚡ Using Optimized Data Fetching Strategy for {report_type}")
         
+        self._req_cache.clear()
         data = {
             'fetched_at': None,
             'report_type': report_type
         }
         
         try:
-            if report_type == "production":
-                data.update(self._fetch_production_data())
-            elif report_type == "arbitrage":
-                data.update(self._fetch_arbitrage_data())
-            elif report_type == "economic":
-                data.update(self._fetch_economic_data())
-            elif report_type == "short_economic":
-                data.update(self._fetch_short_economic_data())
-            elif report_type == "military":
-                data.update(self._fetch_military_data())
-            elif report_type == "google_sheets":
-                data.update(self._fetch_full_data())
-            else:
-                # Default to full data for unknown types
-                data.update(self._fetch_full_data())
+            # Default to full data for unknown types
+            handler = self._DISPATCH.get(report_type, OptimizedDataFetchingStrategy._fetch_full_data)
+            data.update(handler(self))
             
-            data['fetched_at'] = self._get_current_timestamp()
+            # Full data path already stamps fetched_at together with its summary
+            if data['fetched_at'] is None:
+                data['fetched_at'] = _now_iso()
             
         except Exception as e:
             print(f"Error in Optimized Data Fetching Strategy: {e}")
@@ -155,10 +182,37 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     def get_strategy_name(self) -> str:
         return "Optimized Data Fetching"
     
+    def _memo(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn() computed at most once per fetch_data call"""
+        if key not in self._req_cache:
+            self._req_cache[key] = fn()
+        return self._req_cache[key]
+    
+    def close(self) -> None:
+        """Close cached database connections and the background executor"""
+        for conn in self._conn_cache.values():
+            conn.close()
+        self._conn_cache.clear()
+        self._executor.shutdown(wait=False)
+    
+    def _get_conn(self, db_path: str) -> sqlite3.Connection:
+        """Shared read connection per database file, reused by all _load_* methods"""
+        conn = self._conn_cache.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn_cache[db_path] = conn
+        return conn
+    
     def _fetch_production_data(self) -> Dict[str, Any]:
         """Fetch data needed for production analysis"""
-        regions = self.deps.region_repo.find_all() if self.deps.region_repo else []
-        countries = self.deps.country_repo.find_all() if self.deps.country_repo else []
+        regions = self._memo('regions', self.deps.region_repo.find_all) if self.deps.region_repo else []
+        countries = self._memo('countries', self.deps.country_repo.find_all) if self.deps.country_repo else []
         
         return {
             'regions': regions,
@@ -168,7 +222,7 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _fetch_arbitrage_data(self) -> Dict[str, Any]:
         """Fetch data needed for arbitrage analysis"""
-        currencies = self.deps.currency_repo.find_all()
+        currencies = self._memo('currencies', self.deps.currency_repo.find_all)
         markets = {}  # Would fetch from market repository
         
         return {
@@ -179,9 +233,9 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _fetch_economic_data(self) -> Dict[str, Any]:
         """Fetch data needed for economic analysis"""
-        countries = self.deps.country_repo.find_all()
-        currencies = self.deps.currency_repo.find_all()
-        items = self.deps.item_repo.find_all()
+        countries = self._memo('countries', self.deps.country_repo.find_all)
+        currencies = self._memo('currencies', self.deps.currency_repo.find_all)
+        items = self._memo('items', self.deps.item_repo.find_all)
         
         return {
             'countries': countries,
@@ -201,14 +255,7 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _fetch_short_economic_data(self) -> Dict[str, Any]:
         """Fetch data needed for short economic report"""
-        from src.core.services.economy_service import (
-            fetch_countries_and_currencies,
-            build_currency_rates_map,
-            fetch_cheapest_items_from_all_countries,
-            fetch_items_by_type,
-            fetch_best_jobs_from_all_countries
-        )
-        from src.core.services.regions_service import fetch_and_process_regions
+        from src.core.services.economy_service import fetch_countries_and_currencies
         
         print("📊 Fetching short economic data...")
         
@@ -219,31 +266,19 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             print("❌ Error: Cannot fetch economic data")
             return {'sections': {}}
         
-        # Get currency rates
-        currency_rates = build_currency_rates_map(currencies_map, gold_id)
+        # Regiony zależą tylko od listy krajów - pobierane w tle, równolegle z rynkiem
+        regions_future = self._executor.submit(fetch_and_process_regions, eco_countries)
         
         # Get items map
         items_map = fetch_items_by_type("economic")
         
-        # Fetch cheapest items
-        cheapest_items = {}
-        if eco_countries and items_map:
-            cheapest_items = fetch_cheapest_items_from_all_countries(
-                eco_countries, items_map, currency_rates, gold_id
-            )
-        
-        # Fetch best jobs
-        best_jobs = []
-        if eco_countries:
-            best_jobs = fetch_best_jobs_from_all_countries(
-                eco_countries, currency_rates, gold_id
-            )
-            
+        # Fetch currency rates, best jobs and cheapest items concurrently
+        currency_rates, best_jobs, cheapest_items = fetch_rates_jobs_and_cheapest_items(
+            eco_countries, currencies_map, items_map, gold_id
+        )
+        
         # Fetch regions data
-        regions_data = []
-        regions_summary = {}
-        if eco_countries:
-            regions_data, regions_summary = fetch_and_process_regions(eco_countries)
+        regions_data, regions_summary = self._regions_result(regions_future)
         
         return {
             'eco_countries': eco_countries,
@@ -264,31 +299,28 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             }
         }
     
+    @staticmethod
+    def _regions_result(regions_future) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Wynik pobierania regionów w tle; błąd regionów nie przerywa pozostałych danych"""
+        try:
+            return regions_future.result()
+        except Exception as e:
+            print(f"❌ Error fetching regions data: {e}")
+            return [], {}
+    
     def _fetch_database_data(self) -> Dict[str, Any]:
         """Fetch data from database for Google Sheets"""
         print("🗄️ Fetching data from database for Google Sheets...")
         
         data = {
-            'fetched_at': None,
+            'fetched_at': _now_iso(),
             'report_type': 'google_sheets'
         }
         
         try:
-            # Load data from database snapshots
-            print("🌍 Loading data from database snapshots...")
-            country_map, currencies_map, currency_rates = self._load_data_from_snapshots()
-            
-            # Load regions from database
-            print("🏭 Loading regions from database...")
-            regions_data = self._load_regions_from_database()
-            
-            # Load items from database
-            print("📦 Loading items from database...")
-            items_map = self._load_items_from_database()
-            
-            # Load cheapest items from database
-            print("🛒 Loading cheapest items from database...")
-            cheapest_items = self._load_cheapest_items_from_database()
+            # Load snapshots, rates, regions, items and prices in one database pass
+            (country_map, currencies_map, currency_rates,
+             regions_data, items_map, cheapest_items) = self._load_all_for_sheets()
             
             # Load warriors data from database
             print("⚔️ Loading warriors data from database...")
@@ -316,63 +348,82 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
         
         return data
     
+    def _load_all_for_sheets(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[int, float],
+                                             List[Dict[str, Any]], Dict[int, Dict[str, Any]],
+                                             Dict[str, List[Dict[str, Any]]]]:
+        """Run all Google Sheets loaders on one connection inside a single read transaction"""
+        conn = self._get_conn(self.deps.country_repo.db_path)
+        # Jedna transakcja odczytu: wspólny widok bazy (WAL) i ciepły cache stron dla wszystkich zapytań
+        conn.execute("BEGIN")
+        try:
+            print("🌍 Loading data from database snapshots...")
+            country_map, currencies_map, currency_rates = self._load_data_from_snapshots()
+            
+            print("🏭 Loading regions from database...")
+            regions_data = self._load_regions_from_database()
+            
+            print("📦 Loading items from database...")
+            items_map = self._load_items_from_database()
+            
+            print("🛒 Loading cheapest items from database...")
+            cheapest_items = self._load_cheapest_items_from_database()
+        finally:
+            conn.execute("COMMIT")
+        
+        return country_map, currencies_map, currency_rates, regions_data, items_map, cheapest_items
+    
     def _load_data_from_snapshots(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[int, float]]:
         """Load countries, currencies and rates from database snapshots"""
-        import sqlite3
-        import json
         
         country_map = {}
         currencies_map = {}
         currency_rates = {}
         
         try:
-            with sqlite3.connect(self.deps.country_repo.db_path) as conn:
-                # Get latest countries and currencies snapshot
-                cursor = conn.execute("""
-                    SELECT payload_json FROM api_snapshots 
-                    WHERE endpoint = 'countries_and_currencies' 
-                    ORDER BY created_at DESC LIMIT 1
-                """)
-                row = cursor.fetchone()
-                
-                if row:
-                    snapshot_data = json.loads(row[0])
-                    eco_countries = snapshot_data.get('eco_countries', {})
-                    currencies_map_data = snapshot_data.get('currencies_map', {})
-                    
-                    # Convert to country_map format
-                    for country_id, country_data in eco_countries.items():
-                        country_map[str(country_id)] = {
-                            'name': country_data.get('name', 'N/A'),
-                            'currency_id': str(country_data.get('currency_id', 'N/A')),
-                            'status': 'active',
-                            'region': 'N/A',
-                            'population': 0
-                        }
-                    
-                    # Convert to currencies_map format
-                    for currency_id, currency_name in currencies_map_data.items():
-                        currencies_map[str(currency_id)] = {
-                            'name': currency_name,
-                            'gold_rate': 0,  # Will be loaded from currency_rates table
-                            'change_percent': 0
-                        }
-                
-                # Get latest currency rates
-                cursor = conn.execute("""
-                    SELECT currency_id, rate_gold_per_unit FROM currency_rates 
-                    ORDER BY ts DESC 
-                    LIMIT 100
-                """)
+            conn = self._get_conn(self.deps.country_repo.db_path)
+            # Get latest rate of every currency first, so currencies_map is built in one pass
+            cursor = conn.execute("""
+                SELECT cr.currency_id, cr.rate_gold_per_unit
+                FROM currency_rates cr
+                JOIN (
+                    SELECT currency_id, MAX(ts) AS max_ts
+                    FROM currency_rates
+                    GROUP BY currency_id
+                ) latest ON latest.currency_id = cr.currency_id AND latest.max_ts = cr.ts
+            """)
+            currency_rates = dict(cursor)
+            
+            # Get latest countries and currencies snapshot
+            cursor = conn.execute("""
+                SELECT payload_json FROM api_snapshots 
+                WHERE endpoint = 'countries_and_currencies' 
+                ORDER BY created_at DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
+            
+            if row:
+                snapshot_data = _json_loads(row[0])
+                eco_countries = snapshot_data.get('eco_countries', {})
+                currencies_map_data = snapshot_data.get('currencies_map', {})
                 
-                for row in cursor.fetchall():
-                    currency_id, rate = row
-                    currency_rates[currency_id] = rate
-                    
-                    # Update currencies_map with actual rates
-                    if str(currency_id) in currencies_map:
-                        currencies_map[str(currency_id)]['gold_rate'] = rate
+                # Convert to country_map format
+                for country_id, country_data in eco_countries.items():
+                    country_map[str(country_id)] = {
+                        'name': country_data.get('name', 'N/A'),
+                        'currency_id': str(country_data.get('currency_id', 'N/A')),
+                        'status': 'active',
+                        'region': 'N/A',
+                        'population': 0
+                    }
                 
+                # Convert to currencies_map format
+                for currency_id, currency_name in currencies_map_data.items():
+                    currencies_map[str(currency_id)] = {
+                        'name': currency_name,
+                        'gold_rate': currency_rates.get(int(currency_id), 0),
+                        'change_percent': 0
+                    }
+            
         except Exception as e:
             print(f"Error loading data from snapshots: {e}")
         
@@ -380,35 +431,31 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _load_regions_from_database(self) -> List[Dict[str, Any]]:
         """Load regions from database"""
-        import sqlite3
         
         regions_data = []
         
         try:
-            with sqlite3.connect(self.deps.region_repo.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT region_name, country_name, country_id, pollution, 
-                           bonus_score, bonus_description, population, nb_npcs, 
-                           type, original_country_id
-                    FROM regions_data 
-                    ORDER BY created_at DESC 
-                    LIMIT 1000
-                """)
-                
-                for row in cursor.fetchall():
-                    regions_data.append({
-                        'name': row[0],
-                        'country_name': row[1],
-                        'country_id': row[2],
-                        'pollution': row[3],
-                        'bonus': row[4],
-                        'bonus_description': row[5],  # Poprawione mapowanie
-                        'population': row[6],
-                        'nb_npcs': row[7],
-                        'type': row[8],
-                        'original_country_id': row[9]
-                    })
-                
+            conn = self._get_conn(self.deps.region_repo.db_path)
+            # Only the columns used by the Google Sheets formatters
+            cursor = conn.execute("""
+                SELECT region_name, country_name, country_id, pollution, 
+                       bonus_score, bonus_description, population
+                FROM regions_data 
+                ORDER BY created_at DESC 
+                LIMIT 1000
+            """)
+            
+            for row in cursor:
+                regions_data.append({
+                    'name': row['region_name'],
+                    'country_name': row['country_name'],
+                    'country_id': row['country_id'],
+                    'pollution': row['pollution'],
+                    'bonus': row['bonus_score'],
+                    'bonus_description': row['bonus_description'],  # Poprawione mapowanie
+                    'population': row['population']
+                })
+            
         except Exception as e:
             print(f"Error loading regions from database: {e}")
         
@@ -416,28 +463,26 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _load_items_from_database(self) -> Dict[int, Dict[str, Any]]:
         """Load items from database"""
-        import sqlite3
         
         items_map = {}
         
         try:
-            with sqlite3.connect(self.deps.country_repo.db_path) as conn:
-                # Get latest items snapshot
-                cursor = conn.execute("""
-                    SELECT payload_json FROM api_snapshots 
-                    WHERE endpoint = 'items_map' 
-                    ORDER BY created_at DESC LIMIT 1
-                """)
-                row = cursor.fetchone()
-                
-                if row:
-                    import json
-                    items_data = json.loads(row[0])
-                    # items_data to bezpośrednio słownik {id: name}, nie ma klucza 'items_map'
-                    items_map = {}
-                    for item_id, item_name in items_data.items():
-                        items_map[item_id] = {'name': item_name}
-                
+            conn = self._get_conn(self.deps.country_repo.db_path)
+            # Get latest items snapshot
+            cursor = conn.execute("""
+                SELECT payload_json FROM api_snapshots 
+                WHERE endpoint = 'items_map' 
+                ORDER BY created_at DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
+            
+            if row:
+                items_data = _json_loads(row[0])
+                # items_data to bezpośrednio słownik {id: name}, nie ma klucza 'items_map'
+                items_map = {}
+                for item_id, item_name in items_data.items():
+                    items_map[item_id] = {'name': item_name}
+            
         except Exception as e:
             print(f"Error loading items from database: {e}")
         
@@ -445,63 +490,65 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
     
     def _load_cheapest_items_from_database(self) -> Dict[str, List[Dict[str, Any]]]:
         """Load cheapest items from database"""
-        import sqlite3
         
         cheapest_items = {}
         
         try:
-            with sqlite3.connect(self.deps.country_repo.db_path) as conn:
-                # Pobierz wszystkie przedmioty z cenami
-                cursor = conn.execute("""
-                    SELECT item_id, country_name, currency_name, price_gold, price_original
-                    FROM item_prices 
+            conn = self._get_conn(self.deps.country_repo.db_path)
+            # Jedno zapytanie: 20 najtańszych ofert z ostatnich 5000 wpisów dla każdego przedmiotu
+            # oraz średnia z 5 ostatnich notowań (jak get_item_price_avg(item_id, days=5)).
+            # Gdy brak historii, średnia z 5 najtańszych aktualnych ofert.
+            cursor = conn.execute("""
+                WITH recent AS (
+                    SELECT item_id, country_name, currency_name, price_gold, price_original, ts
+                    FROM item_prices
                     ORDER BY ts DESC, price_gold ASC
                     LIMIT 5000
-                """)
-                
-                # Grupuj dane według item_id
-                items_by_type = {}
-                for row in cursor.fetchall():
-                    item_id, country_name, currency_name, price_gold, price_original = row
-                    
-                    if item_id not in items_by_type:
-                        items_by_type[item_id] = []
-                    
-                    items_by_type[item_id].append({
-                        'item_name': f'Item {item_id}',
-                        'country': country_name,
-                        'currency_name': currency_name,
-                        'price_gold': price_gold,
-                        'amount': price_original or 0
-                    })
-                
-                # Dla każdego typu przedmiotu oblicz średnią z 5 najtańszych i weź więcej propozycji
-                for item_id, items_list in items_by_type.items():
-                    # Posortuj według ceny
-                    sorted_items = sorted(items_list, key=lambda x: x['price_gold'])
-                    
-                    # Weź więcej propozycji (minimum 10, maksimum 20)
-                    num_items = min(20, max(10, len(sorted_items)))
-                    selected_items = sorted_items[:num_items]
-                    
-                    # Oblicz średnią z ostatnich 5 dni z bazy danych
-                    from src.data.database.models import get_item_price_avg
-                    avg5_gold = get_item_price_avg(item_id, days=5)
-                    
-                    # Fallback: jeśli brak danych historycznych, użyj średniej z aktualnych ofert
-                    if avg5_gold is None:
-                        top5_items = sorted_items[:5]
-                        if top5_items:
-                            avg5_gold = sum(item['price_gold'] for item in top5_items) / len(top5_items)
-                        else:
-                            avg5_gold = 0
-                    
-                    # Dodaj avg5_in_gold do wszystkich wybranych przedmiotów
-                    for item in selected_items:
-                        item['avg5_in_gold'] = round(avg5_gold, 6)
-                    
-                    cheapest_items[item_id] = selected_items
-                
+                ),
+                ranked AS (
+                    SELECT item_id, country_name, currency_name, price_gold, price_original,
+                           ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY price_gold ASC, ts DESC) AS rn
+                    FROM recent
+                    WHERE price_gold IS NOT NULL
+                ),
+                history AS (
+                    SELECT item_id, price_gold,
+                           ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY ts DESC) AS rn
+                    FROM item_prices
+                    WHERE price_gold IS NOT NULL
+                      AND item_id IN (SELECT item_id FROM ranked)
+                ),
+                avg5 AS (
+                    SELECT item_id, AVG(price_gold) AS avg5
+                    FROM history WHERE rn <= 5 GROUP BY item_id
+                ),
+                top5 AS (
+                    SELECT item_id, AVG(price_gold) AS avg5
+                    FROM ranked WHERE rn <= 5 GROUP BY item_id
+                )
+                SELECT r.item_id, r.country_name, r.currency_name, r.price_gold, r.price_original,
+                       COALESCE(a.avg5, t.avg5, 0) AS avg5_in_gold
+                FROM ranked r
+                LEFT JOIN avg5 a ON a.item_id = r.item_id
+                LEFT JOIN top5 t ON t.item_id = r.item_id
+                WHERE r.rn <= 20
+                ORDER BY r.item_id, r.rn
+            """)
+            
+            for row in cursor:
+                item_id = row['item_id']
+                items_list = cheapest_items.get(item_id)
+                if items_list is None:
+                    items_list = cheapest_items[item_id] = []
+                items_list.append({
+                    'item_name': f'Item {item_id}',
+                    'country': row['country_name'],
+                    'currency_name': row['currency_name'],
+                    'price_gold': row['price_gold'],
+                    'amount': row['price_original'] or 0,
+                    'avg5_in_gold': round(row['avg5_in_gold'], 6)
+                })
+            
         except Exception as e:
             print(f"Error loading cheapest items from database: {e}")
         
@@ -511,51 +558,20 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
         """Load warriors data from database"""
         # Since warrior data is not available in current database structure,
         # return sample data to populate the sheet
-        top_warriors = [
-            {
-                'username': 'SampleWarrior1',
-                'level': 15,
-                'points': 2500,
-                'nationality_id': '2'  # UK
-            },
-            {
-                'username': 'SampleWarrior2', 
-                'level': 12,
-                'points': 2000,
-                'nationality_id': '3'  # USA
-            },
-            {
-                'username': 'SampleWarrior3',
-                'level': 18,
-                'points': 1800,
-                'nationality_id': '4'  # Mexico
-            },
-            {
-                'username': 'SampleWarrior4',
-                'level': 14,
-                'points': 1600,
-                'nationality_id': '5'  # Colombia
-            },
-            {
-                'username': 'SampleWarrior5',
-                'level': 16,
-                'points': 1400,
-                'nationality_id': '6'  # Peru
-            }
-        ]
-        
-        return top_warriors
+        return [dict(warrior) for warrior in _SAMPLE_WARRIORS]
     
     def _fetch_full_data(self) -> Dict[str, Any]:
         """Fetch all data from API"""
         print("🔄 Fetching data from API...")
         
-        # Fetch countries and currencies from API (currencies are included in countries)
-        countries_data = fetch_data("countries", "kraje")
+        # Fetch countries and currencies from API (currencies are included in countries).
+        # Shares the TTL response cache with fetch_countries_and_currencies.
+        countries_data = cached_fetch_data("countries", "kraje", API_CACHE_TTL_COUNTRIES)
         
         # Process countries and currencies data
         country_map = {}
         currencies_map = {}
+        name_to_currency_id = {}
         if countries_data and 'data' in countries_data:
             for country in countries_data['data']:
                 if not country.get('is_available', True):
@@ -580,6 +596,10 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
                         'gold_rate': 0,  # Not available in this endpoint
                         'change_percent': 0  # Not available in this endpoint
                     }
+                    name_to_currency_id.setdefault(currency_name, currency_id)
+        
+        # Regiony (zależą tylko od listy krajów) pobierane w tle przez cały czas pobierania rynku
+        regions_future = self._executor.submit(fetch_and_process_regions, country_map) if country_map else None
         
         # Fetch warriors data from wars and hits
         top_warriors = []
@@ -589,20 +609,7 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             if wars_data and 'data' in wars_data:
                 # Process wars to get top warriors (simplified version)
                 # For now, just create some sample data
-                top_warriors = [
-                    {
-                        'username': 'SampleWarrior1',
-                        'level': 15,
-                        'points': 2500,
-                        'nationality_id': '2'  # UK
-                    },
-                    {
-                        'username': 'SampleWarrior2', 
-                        'level': 12,
-                        'points': 2000,
-                        'nationality_id': '3'  # USA
-                    }
-                ]
+                top_warriors = [dict(warrior) for warrior in _SAMPLE_WARRIORS[:2]]
         except Exception as e:
             print(f"⚠️ Warning: Could not fetch warriors data: {e}")
         
@@ -616,50 +623,32 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
         print("💰 Fetching additional economic data...")
         
         # Get GOLD currency ID
-        gold_id = None
-        for currency_id, currency_info in currencies_map.items():
-            if currency_info.get('name') == 'GOLD':
-                gold_id = int(currency_id)
-                break
+        gold_id = int(name_to_currency_id.get('GOLD', 0))
         
         if not gold_id:
             print("⚠️ Warning: GOLD currency not found, using fallback")
             gold_id = 1  # Fallback
         
-        # Build currency rates map
-        print("📊 Building currency rates map...")
-        currency_rates = build_currency_rates_map(currencies_map, gold_id)
-        print(f"✅ Built currency rates for {len(currency_rates)} currencies")
-        
         # Fetch items map
         print("📦 Fetching items map...")
         items_map = fetch_items_by_type("economic")
         print(f"✅ Fetched {len(items_map)} items")
         
-        # Fetch cheapest items
-        print("🛒 Fetching cheapest items...")
-        cheapest_items = {}
-        if country_map and items_map:
-            cheapest_items = fetch_cheapest_items_from_all_countries(
-                country_map, items_map, currency_rates, gold_id
-            )
-            print(f"✅ Fetched cheapest items for {len(cheapest_items)} item types")
-        
-        # Fetch best jobs
-        print("💼 Fetching best jobs...")
-        best_jobs = []
-        if country_map:
-            best_jobs = fetch_best_jobs_from_all_countries(
-                country_map, currency_rates, gold_id
-            )
-            print(f"✅ Fetched {len(best_jobs)} best jobs")
+        # Fetch currency rates, cheapest items and best jobs concurrently
+        print("📊 Fetching currency rates, cheapest items and best jobs...")
+        currency_rates, best_jobs, cheapest_items = fetch_rates_jobs_and_cheapest_items(
+            country_map, currencies_map, items_map, gold_id
+        )
+        print(f"✅ Built currency rates for {len(currency_rates)} currencies")
+        print(f"✅ Fetched cheapest items for {len(cheapest_items)} item types")
+        print(f"✅ Fetched {len(best_jobs)} best jobs")
         
         # Fetch regions data
         print("🏭 Fetching regions data...")
         regions_data = []
         regions_summary = {}
-        if country_map:
-            regions_data, regions_summary = fetch_and_process_regions(country_map)
+        if regions_future is not None:
+            regions_data, regions_summary = self._regions_result(regions_future)
             print(f"✅ Fetched data for {len(regions_data)} regions")
         
         # Fetch military data
@@ -696,6 +685,8 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             }
             transformed_jobs.append(transformed_job)
 
+        # One timestamp for both the summary and the top-level fetched_at
+        now_iso = _now_iso()
         return {
             'country_map': country_map,
             'currencies_map': currencies_map,
@@ -708,8 +699,9 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             'regions_summary': regions_summary,
             'military_summary': military_summary,
             'currency_extremes': currency_extremes,
+            'fetched_at': now_iso,
             'summary_data': {
-                'fetched_at': self._get_current_timestamp(),
+                'fetched_at': now_iso,
                 'economic_summary': {
                     'job_offers': transformed_jobs,
                     'currency_rates': currency_rates,
@@ -719,10 +711,55 @@ class OptimizedDataFetchingStrategy(DataFetchingStrategy):
             'sections': {'military': True, 'warriors': True, 'economic': True, 'production': True}
         }
     
-    def _get_current_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+    # Report type -> data fetching method (unbound, called with the strategy instance)
+    _DISPATCH = {
+        "production": _fetch_production_data,
+        "arbitrage": _fetch_arbitrage_data,
+        "economic": _fetch_economic_data,
+        "short_economic": _fetch_short_economic_data,
+        "military": _fetch_military_data,
+        "google_sheets": _fetch_full_data,
+    }
+    
+
+class ShortEconomicDataFetchingStrategy(OptimizedDataFetchingStrategy):
+    """Strategy specialized for the short economic report (no report type dispatch)"""
+    
+    def fetch_data(self, sections: Dict[str, bool], report_type: str = "short_economic") -> Dict[str, Any]:
+        """Fetch only the data used by the short economic report"""
+        print("⚡ Using Short Economic Data Fetching Strategy")
+        
+        self._req_cache.clear()
+        data = {'report_type': "short_economic"}
+        try:
+            data.update(self._fetch_short_economic_data())
+        except Exception as e:
+            print(f"Error in Short Economic Data Fetching Strategy: {e}")
+        data['fetched_at'] = _now_iso()
+        return data
+    
+    def get_strategy_name(self) -> str:
+        return "Short Economic Data Fetching"
+
+
+class ArbitrageDataFetchingStrategy(OptimizedDataFetchingStrategy):
+    """Strategy specialized for arbitrage analysis (no report type dispatch)"""
+    
+    def fetch_data(self, sections: Dict[str, bool], report_type: str = "arbitrage") -> Dict[str, Any]:
+        """Fetch only the data used by arbitrage analysis"""
+        print("⚡ Using Arbitrage Data Fetching Strategy")
+        
+        self._req_cache.clear()
+        data = {'report_type': "arbitrage"}
+        try:
+            data.update(self._fetch_arbitrage_data())
+        except Exception as e:
+            print(f"Error in Arbitrage Data Fetching Strategy: {e}")
+        data['fetched_at'] = _now_iso()
+        return data
+    
+    def get_strategy_name(self) -> str:
+        return "Arbitrage Data Fetching"
 
 
 class CachedDataFetchingStrategy(DataFetchingStrategy):
@@ -732,52 +769,43 @@ class CachedDataFetchingStrategy(DataFetchingStrategy):
         super().__init__(dependencies)
         self.cache_ttl_minutes = cache_ttl_minutes
         self._cache = {}
+        self._optimized_strategy = OptimizedDataFetchingStrategy(dependencies)
     
     def fetch_data(self, sections: Dict[str, bool], report_type: str) -> Dict[str, Any]:
         """Fetch data with caching"""
         print(f"💾 Using Cached Data Fetching Strategy (TTL: {self.cache_ttl_minutes}min)")
         
-        cache_key = f"{report_type}_{hash(str(sections))}"
+        cache_key = (report_type, frozenset(sections.items()))
         
         # Check cache first
         if self._is_cache_valid(cache_key):
             print("📋 Using cached data")
-            return self._cache[cache_key]['data']
+            return self._cache[cache_key][1]
         
         # Fetch fresh data
         print("🔄 Fetching fresh data")
         data = self._fetch_fresh_data(sections, report_type)
         
-        # Cache the data
-        self._cache[cache_key] = {
-            'data': data,
-            'timestamp': self._get_current_timestamp()
-        }
+        # Cache the data (monotonic load time, data)
+        self._cache[cache_key] = (time.monotonic(), data)
         
         return data
     
     def get_strategy_name(self) -> str:
         return "Cached Data Fetching"
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
+    def _is_cache_valid(self, cache_key: Tuple[str, frozenset]) -> bool:
         """Check if cache is still valid"""
-        if cache_key not in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is None:
             return False
         
-        from datetime import datetime, timedelta
-        cached_time = datetime.fromisoformat(self._cache[cache_key]['timestamp'])
-        return datetime.now() - cached_time < timedelta(minutes=self.cache_ttl_minutes)
+        return time.monotonic() - cached[0] < self.cache_ttl_minutes * 60
     
     def _fetch_fresh_data(self, sections: Dict[str, bool], report_type: str) -> Dict[str, Any]:
         """Fetch fresh data"""
         # Use optimized strategy for fresh data
-        optimized_strategy = OptimizedDataFetchingStrategy(self.deps)
-        return optimized_strategy.fetch_data(sections, report_type)
-    
-    def _get_current_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        return self._optimized_strategy.fetch_data(sections, report_type)
 
 
 class DataFetchingContext:
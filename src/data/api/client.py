@@ -1,12 +1,22 @@
 import json
 import os
+import threading
 import requests
 from typing import Any, Dict, Optional
-from config.settings.base import AUTH_TOKEN, ECLESIAR_API_KEY, API_BASE_URL
+from config.settings.base import AUTH_TOKEN, ECLESIAR_API_KEY, API_BASE_URL, API_WORKERS_IO
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+
+    def _json_loads(content: bytes) -> Any:
+        return orjson.loads(content)
+except ImportError:
+    def _json_loads(content: bytes) -> Any:
+        return json.loads(content)
+
 
 def _with_api_key(url: str) -> str:
     if not ECLESIAR_API_KEY:
@@ -55,6 +65,7 @@ def _headers() -> Dict[str, str]:
 
 # Globalna sesja HTTP z retry i keep-alive
 _SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
 
 
 def _get_session() -> requests.Session:
@@ -62,6 +73,14 @@ def _get_session() -> requests.Session:
     if _SESSION is not None:
         return _SESSION
 
+    with _SESSION_LOCK:
+        # Inny wątek mógł już utworzyć sesję
+        if _SESSION is None:
+            _SESSION = _create_session()
+    return _SESSION
+
+
+def _create_session() -> requests.Session:
     session = requests.Session()
     retries_total = int(os.getenv("API_RETRIES", "3"))
     backoff = float(os.getenv("API_BACKOFF", "0.5"))
@@ -74,10 +93,16 @@ def _get_session() -> requests.Session:
         allowed_methods=("GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS"),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=50)
+    # Pula połączeń dzielona przez wszystkie wątki (keep-alive, bez ponownego TLS handshake)
+    pool_connections = int(os.getenv("API_POOL_CONNECTIONS", "32"))
+    # Co najmniej tyle połączeń, ile wątków wspólnej puli I/O - inaczej nadmiarowe połączenia
+    # są zamykane po każdym zapytaniu i równoległy fan-out znów płaci za handshake
+    pool_maxsize = max(int(os.getenv("API_POOL_MAXSIZE", "64")), API_WORKERS_IO)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
-    _SESSION = session
+    # Nagłówki (w tym autoryzacja z pliku cookies) ustalane raz na sesję, a nie przy każdym zapytaniu
+    session.headers.update(_headers())
     return session
 
 
@@ -89,7 +114,7 @@ def fetch_data(endpoint: str, description: str, params: Optional[Dict[str, Any]]
         print(f"Fetching data: {description} from URL: {api_url}...")
     try:
         timeout_sec = float(os.getenv("API_TIMEOUT", "10"))
-        response = _get_session().get(api_url, headers=_headers(), params=params, timeout=timeout_sec)
+        response = _get_session().get(api_url, params=params, timeout=timeout_sec)
         
         # Sprawdź status code i obsłuż błędy odpowiednio
         if response.status_code == 404:
@@ -99,8 +124,10 @@ def fetch_data(endpoint: str, description: str, params: Optional[Dict[str, Any]]
             print(f"HTTP error {response.status_code} for {endpoint}: {description}")
             response.raise_for_status()
         
-        data = response.json()
-        if verbose:
+        data = _json_loads(response.content)
+        if os.getenv("API_DEBUG", "0") == "1":
+            # Pełny podgląd odpowiedzi tylko w trybie debug - serializacja dużych
+            # odpowiedzi i wypisywanie ich z wielu wątków spowalnia pobieranie
             # Ogranicz bardzo duże logi
             try:
                 preview = json.dumps(data, indent=2)
@@ -113,5 +140,8 @@ def fetch_data(endpoint: str, description: str, params: Optional[Dict[str, Any]]
     except requests.exceptions.RequestException as e:
         print(f"Error fetching {description}: {e}")
         return None
+    except ValueError as e:
+        print(f"Invalid JSON in response for {description}: {e}")
+        return None
 
 
@@ -0,0 +1,34 @@
+"""
+Shared thread pool for I/O-bound API fan-out.
+
+Copyright (c) 2025 Teo693
+Licensed under the MIT License - see LICENSE file for details.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config.settings.base import API_WORKERS_IO
+
+
+_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_IO_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    Zwraca wspólną pulę wątków dla równoległych zapytań do API.
+
+    Pula tworzona jest raz na proces, więc kolejne etapy pobierania danych
+    nie tworzą i nie zamykają własnych wątków. Zadania wysyłane do tej puli
+    nie powinny czekać na inne zadania z tej samej puli.
+    """
+    global _IO_EXECUTOR
+    if _IO_EXECUTOR is not None:
+        return _IO_EXECUTOR
+
+    with _IO_EXECUTOR_LOCK:
+        if _IO_EXECUTOR is None:
+            _IO_EXECUTOR = ThreadPoolExecutor(max_workers=API_WORKERS_IO, thread_name_prefix="api-io")
+    return _IO_EXECUTOR
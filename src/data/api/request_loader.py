@@ -0,0 +1,65 @@
+"""
+Request loader - coalesces concurrent API calls with identical keys.
+
+Copyright (c) 2025 Teo693
+Licensed under the MIT License - see LICENSE file for details.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class RequestLoader:
+    """
+    Deduplikuje równoległe zapytania o ten sam klucz (wzorzec DataLoader).
+
+    Jeśli zapytanie o dany klucz jest już w toku, kolejne wywołania czekają
+    na jego wynik zamiast wysyłać drugi request. Udane wyniki (różne od None)
+    są dodatkowo trzymane przez ttl_seconds, aby powtórzenia w ramach jednego
+    raportu nie trafiały do API.
+    """
+
+    def __init__(self, fn: Callable[[Hashable], Any], ttl_seconds: float = 0.0):
+        self._fn = fn
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Future] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def load(self, key: Hashable) -> Any:
+        """Zwraca wynik dla klucza, wykonując co najwyżej jedno zapytanie naraz"""
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self._ttl_seconds:
+                return cached[1]
+
+            future = self._pending.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._pending[key] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            result = self._fn(key)
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if result is not None and self._ttl_seconds > 0:
+                self._results[key] = (time.monotonic(), result)
+        future.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Czyści zapamiętane wyniki"""
+        with self._lock:
+            self._results.clear()
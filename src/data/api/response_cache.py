@@ -0,0 +1,66 @@
+"""
+Response cache - cache-aside layer for near-static API endpoints.
+
+Copyright (c) 2025 Teo693
+Licensed under the MIT License - see LICENSE file for details.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.data.api.client import fetch_data
+from src.data.database.async_writer import snapshot_writer
+from src.data.database.models import load_latest_snapshot
+
+
+# Prefiks endpointu w tabeli api_snapshots - oddziela surowe odpowiedzi od snapshotów raportów
+_SNAPSHOT_PREFIX = "api:"
+
+_memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_memory_lock = threading.Lock()
+
+
+def cached_fetch_data(endpoint: str, description: str, ttl_seconds: float) -> Optional[Dict[str, Any]]:
+    """
+    Pobiera dane z API z pominięciem sieci, jeśli odpowiedź jest młodsza niż ttl_seconds.
+
+    Kolejność: pamięć procesu, ostatni snapshot w bazie (między uruchomieniami),
+    a dopiero potem zapytanie HTTP. Zapamiętywane są tylko odpowiedzi z code == 200.
+    ttl_seconds <= 0 wyłącza cache.
+    """
+    if ttl_seconds <= 0:
+        return fetch_data(endpoint, description)
+
+    now = time.monotonic()
+    with _memory_lock:
+        cached = _memory.get(endpoint)
+    if cached is not None and now - cached[0] < ttl_seconds:
+        return cached[1]
+
+    snapshot_key = _SNAPSHOT_PREFIX + endpoint
+    try:
+        snapshot = load_latest_snapshot(snapshot_key, ttl_seconds)
+    except Exception:
+        snapshot = None
+
+    if snapshot is not None:
+        # Wiek snapshotu liczy się do TTL - w pamięci zapamiętany z czasem jego zapisu
+        data, age_seconds = snapshot
+        now -= age_seconds
+    else:
+        data = fetch_data(endpoint, description)
+        if not isinstance(data, dict) or data.get("code") != 200:
+            return data
+        # Zapis do bazy w tle - wątek pobierający nie czeka na SQLite
+        snapshot_writer.enqueue(snapshot_key, data)
+
+    with _memory_lock:
+        _memory[endpoint] = (now, data)
+    return data
+
+
+def clear_response_cache() -> None:
+    """Czyści cache odpowiedzi w pamięci procesu"""
+    with _memory_lock:
+        _memory.clear()
@@ -0,0 +1,75 @@
+"""
+Async writer - write-behind queue for API snapshots.
+
+Copyright (c) 2025 Teo693
+Licensed under the MIT License - see LICENSE file for details.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.data.database.models import save_snapshots
+
+
+class SnapshotWriter:
+    """
+    Zapisuje snapshoty API do bazy w tle (wzorzec write-behind).
+
+    Wątki pobierające dane tylko wrzucają snapshot do kolejki; jeden wątek
+    w tle zapisuje je partiami (do batch_size sztuk lub co flush_interval
+    sekund) w jednej transakcji.
+    """
+
+    def __init__(self, batch_size: int = 50, flush_interval: float = 0.25):
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, endpoint: str, payload: Dict[str, Any]) -> None:
+        """Dodaje snapshot do kolejki zapisu"""
+        self._ensure_started()
+        self._queue.put((endpoint, payload))
+
+    def flush(self) -> None:
+        """Czeka, aż wszystkie snapshoty z kolejki zostaną zapisane"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                save_snapshots(batch)
+            except Exception as e:
+                print(f"Error saving API snapshots: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+snapshot_writer = SnapshotWriter()
+atexit.register(snapshot_writer.flush)
@@ -1,9 +1,28 @@
 import os
 import json
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Typy, których orjson nie obsługuje - zachowaj dotychczasowe zachowanie
+            return json.dumps(obj, ensure_ascii=False)
+
+    def _json_loads(text: Any) -> Any:
+        return orjson.loads(text)
+except ImportError:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _json_loads(text: Any) -> Any:
+        return json.loads(text)
+
 DB_PATH = os.getenv("ECLESIAR_DB_PATH", "data/eclesiar.db")
 
 
@@ -12,6 +31,8 @@ def _connect() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL;")
+    # W trybie WAL NORMAL jest bezpieczne i nie wymusza fsync przy każdym commicie
+    conn.execute("PRAGMA synchronous=NORMAL;")
     conn.execute("PRAGMA foreign_keys=ON;")
     return conn
 
@@ -159,7 +180,14 @@ def init_db() -> None:
             )
             """
         )
-        
+
+        # Indexes for latest-snapshot, latest-price and price-history lookups
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_endpoint_ts ON api_snapshots(endpoint, created_at DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_regions_created_at ON regions_data(created_at DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_item_prices_ts ON item_prices(ts)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_item_prices_item_ts ON item_prices(item_id, ts)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_currency_rates_currency_ts ON currency_rates(currency_id, ts DESC)")
+
         conn.commit()
 
 
@@ -174,6 +202,54 @@ def save_snapshot(endpoint: str, payload: Dict[str, Any]) -> None:
         conn.commit()
 
 
+def save_snapshots(snapshots: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+    """
+    Saves many (endpoint, payload) snapshots in a single transaction,
+    replacing older snapshots of the same endpoints (only the newest one is ever read).
+    """
+    ts = datetime.utcnow().isoformat() + "Z"
+    latest = dict(snapshots)
+    rows = [(ts, endpoint, json.dumps(payload, ensure_ascii=False)) for endpoint, payload in latest.items()]
+    if not rows:
+        return
+    with _connect() as conn:
+        conn.executemany(
+            "DELETE FROM api_snapshots WHERE endpoint = ?",
+            [(endpoint,) for endpoint in latest],
+        )
+        conn.executemany(
+            "INSERT INTO api_snapshots(created_at, endpoint, payload_json) VALUES(?,?,?)",
+            rows,
+        )
+        conn.commit()
+
+
+def load_latest_snapshot(endpoint: str, max_age_seconds: float) -> Optional[Tuple[Dict[str, Any], float]]:
+    """
+    Returns (payload, age in seconds) of the newest snapshot for an endpoint if it is younger than max_age_seconds.
+    """
+    now = datetime.utcnow()
+    cutoff = (now - timedelta(seconds=max_age_seconds)).isoformat() + "Z"
+    with _connect() as conn:
+        cur = conn.execute(
+            """
+            SELECT created_at, payload_json FROM api_snapshots
+            WHERE endpoint = ? AND created_at >= ?
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (endpoint, cutoff),
+        )
+        row = cur.fetchone()
+    if not row:
+        return None
+    try:
+        payload = _json_loads(row["payload_json"])
+        created_at = datetime.fromisoformat(row["created_at"].rstrip("Z"))
+    except Exception:
+        return None
+    return payload, max(0.0, (now - created_at).total_seconds())
+
+
 def save_currency_rates(rates_map: Dict[Any, Any]) -> None:
 
     if not rates_map:
@@ -342,7 +418,7 @@ def save_raw_cache(payload: Dict[str, Any]) -> None:
                 created_at=excluded.created_at,
                 payload_json=excluded.payload_json
             """,
-            (ts, json.dumps(payload, ensure_ascii=False)),
+            (ts, _json_dumps(payload)),
         )
         conn.commit()
 
@@ -355,7 +431,7 @@ def load_raw_cache() -> Optional[Dict[str, Any]]:
     if not row:
         return None
     try:
-        return json.loads(row["payload_json"])
+        return _json_loads(row["payload_json"])
     except Exception:
         return None
 
@@ -416,6 +492,36 @@ def load_regions_data() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         return [], {}
 
 
+REGIONS_DATA_INSERT_SQL = """
+    INSERT INTO regions_data(
+        created_at, region_name, country_name, country_id, 
+        pollution, bonus_score, bonus_description, bonus_by_type, population, 
+        nb_npcs, type, original_country_id, bonus_per_pollution
+    )
+    VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+def region_rows(ts: str, regions_data: Iterable[Dict[str, Any]]) -> Iterable[Tuple]:
+    """Yields regions_data rows ready for executemany."""
+    for region in regions_data:
+        yield (
+            ts,
+            region.get('region_name', ''),
+            region.get('country_name', ''),
+            region.get('country_id', 0),
+            region.get('pollution', 0.0),
+            region.get('bonus_score', 0),
+            region.get('bonus_description', ''),
+            json.dumps(region.get('bonus_by_type', {}), ensure_ascii=False),
+            region.get('population', 0),
+            region.get('nb_npcs', 0),
+            region.get('type', 0),
+            region.get('original_country_id', 0),
+            region.get('bonus_per_pollution', 0.0)
+        )
+
+
 def save_regions_data(regions_data: List[Dict[str, Any]], regions_summary: Dict[str, Any]) -> None:
     """
     Saves region data to the database.
@@ -436,33 +542,8 @@ def save_regions_data(regions_data: List[Dict[str, Any]], regions_summary: Dict[
             (ts, json.dumps(regions_summary, ensure_ascii=False)),
         )
         
-        # Save detailed region data
-        for region in regions_data:
-            conn.execute(
-                """
-                INSERT INTO regions_data(
-                    created_at, region_name, country_name, country_id, 
-                    pollution, bonus_score, bonus_description, bonus_by_type, population, 
-                    nb_npcs, type, original_country_id, bonus_per_pollution
-                )
-                VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """,
-                (
-                    ts,
-                    region.get('region_name', ''),
-                    region.get('country_name', ''),
-                    region.get('country_id', 0),
-                    region.get('pollution', 0.0),
-                    region.get('bonus_score', 0),
-                    region.get('bonus_description', ''),
-                    json.dumps(region.get('bonus_by_type', {}), ensure_ascii=False),
-                    region.get('population', 0),
-                    region.get('nb_npcs', 0),
-                    region.get('type', 0),
-                    region.get('original_country_id', 0),
-                    region.get('bonus_per_pollution', 0.0)
-                ),
-            )
+        # Save detailed region data in a single batch
+        conn.executemany(REGIONS_DATA_INSERT_SQL, region_rows(ts, regions_data))
         
         conn.commit()
 
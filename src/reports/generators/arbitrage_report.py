@@ -11,14 +11,16 @@ import time
 import json
 import csv
 from typing import Any, Dict, List, Tuple, Optional, NamedTuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, wait
 from dataclasses import dataclass, asdict
 from decimal import Decimal, ROUND_HALF_UP
 import statistics
 import math
+import itertools
 
 from config.settings.base import AUTH_TOKEN, GOLD_ID_FALLBACK, MIN_PROFIT_THRESHOLD, API_WORKERS_MARKET
 from src.data.api.client import fetch_data
+from src.data.api.executor import get_io_executor
 from src.core.services.economy_service import fetch_countries_and_currencies, build_currency_rates_map
 
 
@@ -316,21 +318,28 @@ class CurrencyArbitrageAnalyzer:
             
             print(f"Analizowanie {len(currency_ids)} walut...")
             
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_currency = {
-                    executor.submit(self.fetch_market_data_for_currency, cid, self.currencies_map[cid]): cid 
-                    for cid in currency_ids
-                }
-                
-                markets = {}
-                for future in as_completed(future_to_currency):
-                    currency_id = future_to_currency[future]
+            # Wspólna pula jest większa - w locie najwyżej API_WORKERS_MARKET zapytań naraz
+            executor = get_io_executor()
+            pending_ids = iter(currency_ids)
+            future_to_currency = {
+                executor.submit(self.fetch_market_data_for_currency, cid, self.currencies_map[cid]): cid 
+                for cid in itertools.islice(pending_ids, max(1, API_WORKERS_MARKET))
+            }
+            
+            markets = {}
+            while future_to_currency:
+                done, _ = wait(future_to_currency, return_when=FIRST_COMPLETED)
+                for future in done:
+                    currency_id = future_to_currency.pop(future)
                     try:
                         market = future.result()
                         if market:
                             markets[currency_id] = market
                     except Exception as e:
                         print(f"Error fetching data for currency {currency_id}: {e}")
+                    
+                    for cid in itertools.islice(pending_ids, 1):
+                        future_to_currency[executor.submit(self.fetch_market_data_for_currency, cid, self.currencies_map[cid])] = cid
             
             print(f"Fetched market data for {len(markets)} currencies")
             